@@ -14,6 +14,13 @@ import json
 import subprocess
 import urllib.parse
 
+GH_REPLAY_ENV = "TLDR_GH_REPLAY"
+GH_RECORD_ENV = "TLDR_GH_RECORD"
+
+# The GET responses of this process, shared by the scripts run in one process (see maintenance.py pipeline). Issues
+# created or updated by this process are updated in the cached lists of issues, see update_gh_responses.
+GH_GET_RESPONSES = {}
+
 
 class Colors(str, Enum):
     def __str__(self):
@@ -96,6 +103,103 @@ def get_locale(path: Path) -> str:
     return locale
 
 
+class Topics(str, Enum):
+    def __str__(self):
+        return str(
+            self.value
+        )  # make str(Topics.TOPIC) return the Topic instead of an Enum object
+
+    INCONSISTENT = "inconsistent filename(s)"
+    MALFORMED_OR_OUTDATED_MORE_INFO_LINK = (
+        "malformed or outdated more info link page(s)"
+    )
+    MALFORMED_OR_OUTDATED_SEE_ALSO_MENTIONS = (
+        "malformed or outdated see also mention(s)"
+    )
+    ALIAS_PAGES = "missing alias page(s)"
+    PAGE_TITLES = "mismatched page title(s)"
+    MISSING_TLDR = "missing TLDR page(s)"
+    ORPHANED = "orphaned page(s)"
+    MISPLACED = "misplaced page(s)"
+    BASED_ON_COMMAND_COUNT = "outdated page(s) based on number of commands"
+    BASED_ON_COMMAND_CONTENTS = "outdated page(s) based on the commands itself"
+    BASED_ON_HEADER_LINE_COUNT = "outdated page(s) based on number of header lines"
+    MISSING_ENGLISH = "missing English page(s)"
+    MISSING_TRANSLATED = "missing translated page(s)"
+    LINT_ERRORS = "linter error(s)"
+
+
+def get_topic_title(topic: str) -> str:
+    """
+    Get the title of a topic, e.g. "missing TLDR page(s)" for "missing-tldr".
+    """
+
+    return Topics[topic.replace("-", "_").upper()].value
+
+
+# The file every topic is written to in a check-pages directory by calculate-metrics.sh, with "-{locale}" left out
+# for English.
+CHECK_PAGES_TOPIC_FILES = {
+    "inconsistent": "inconsistent-{locale}-filenames.txt",
+    "malformed-or-outdated-more-info-link": "malformed-or-outdated-more-info-link-{locale}-pages.txt",
+    "malformed-or-outdated-see-also-mentions": "malformed-or-outdated-see-also-mentions-{locale}-pages.txt",
+    "alias-pages": "missing-{locale}-alias-pages.txt",
+    "page-titles": "mismatched-{locale}-page-titles.txt",
+    "missing-tldr": "missing-tldr-{locale}-pages.txt",
+    "orphaned": "orphaned-{locale}-pages.txt",
+    "misplaced": "misplaced-{locale}-pages.txt",
+    "based-on-command-count": "outdated-{locale}-pages-based-on-command-count.txt",
+    "based-on-command-contents": "outdated-{locale}-pages-based-on-command-contents.txt",
+    "based-on-header-line-count": "outdated-{locale}-pages-based-on-header-line-count.txt",
+    "missing-english": "missing-english-{locale}-pages.txt",
+    "missing-translated": "missing-translated-{locale}-pages.txt",
+    "lint-errors": "lint-errors-{locale}.txt",
+}
+
+# The file every topic is merged into for all locales by calculate-metrics.sh, the orphaned pages aren't merged.
+MERGED_TOPIC_FILES = {
+    "inconsistent": "inconsistent-filenames.txt",
+    "malformed-or-outdated-more-info-link": "malformed-or-outdated-more-info-link-pages.txt",
+    "malformed-or-outdated-see-also-mentions": "malformed-or-outdated-see-also-mentions.txt",
+    "alias-pages": "missing-alias-pages.txt",
+    "page-titles": "mismatched-page-titles.txt",
+    "missing-tldr": "missing-tldr-pages.txt",
+    "misplaced": "misplaced-pages.txt",
+    "based-on-command-count": "outdated-pages-based-on-command-count.txt",
+    "based-on-command-contents": "outdated-pages-based-on-command-contents.txt",
+    "based-on-header-line-count": "outdated-pages-based-on-header-line-count.txt",
+    "missing-english": "missing-english-pages.txt",
+    "missing-translated": "missing-translated-pages.txt",
+    "lint-errors": "lint-errors.txt",
+}
+
+# English more info links are only checked for being malformed.
+ENGLISH_TOPIC_FILES = {
+    "malformed-or-outdated-more-info-link": "malformed-more-info-link-pages.txt",
+}
+
+
+def get_topic_files(locale: str) -> dict[str, str]:
+    """
+    Get the topic of every file in the check-pages directory of a locale.
+
+    Parameters:
+    locale (str): the locale of the check-pages directory, e.g. "fr" or "en".
+
+    Returns:
+    dict: the topic (e.g. "missing-tldr") per filename (e.g. "missing-tldr-fr-pages.txt").
+    """
+
+    topic_files = {}
+    for topic, template in CHECK_PAGES_TOPIC_FILES.items():
+        if locale == "en":
+            filename = ENGLISH_TOPIC_FILES.get(topic, template.replace("-{locale}", ""))
+        else:
+            filename = template.format(locale=locale)
+        topic_files[filename] = topic
+    return topic_files
+
+
 def create_colored_line(start_color: str, text: str) -> str:
     """
     Create a colored line.
@@ -111,6 +215,125 @@ def create_colored_line(start_color: str, text: str) -> str:
     return f"{start_color}{text}{Colors.RESET}"
 
 
+def load_gh_responses(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_gh_responses(
+    method: str, endpoint: str, result: subprocess.CompletedProcess
+):
+    """
+    Update the cached GET responses after a request that changed something.
+
+    A created issue is added to the cached lists of issues and an updated issue is updated in them, so the next list
+    of issues doesn't have to be requested again. Any other change clears the cached responses.
+
+    Parameters:
+    method (str): the method of the request, e.g. "PATCH".
+    endpoint (str): the endpoint of the request, e.g. "/repos/tldr-pages/tldr-maintenance/issues/1".
+    result (CompletedProcess): the result of the request.
+    """
+
+    issues_endpoint, _, number = endpoint.rpartition("/")
+    if method == "POST" and endpoint.endswith("/issues"):
+        issues_endpoint = endpoint
+    elif method != "PATCH" or not issues_endpoint.endswith("/issues"):
+        GH_GET_RESPONSES.clear()
+        return
+
+    if result.returncode != 0:
+        return
+    response = json.loads(result.stdout)
+
+    for key, cached in GH_GET_RESPONSES.items():
+        if key.split("?")[0] != f"GET {issues_endpoint}":
+            continue
+        issues = json.loads(cached.stdout)
+        if method == "POST":
+            # The issues are listed newest first.
+            issues.insert(0, response)
+        else:
+            issues = [
+                {**issue, **response} if str(issue["number"]) == number else issue
+                for issue in issues
+            ]
+        GH_GET_RESPONSES[key] = subprocess.CompletedProcess(
+            cached.args, 0, json.dumps(issues), ""
+        )
+
+
+def run_gh_api(
+    command: list[str], body: str | None = None
+) -> subprocess.CompletedProcess:
+    """
+    Run a `gh api` command, unless GitHub API calls are being recorded or replayed.
+
+    When the environment variable TLDR_GH_REPLAY points to a file of recorded responses, GET requests are answered from
+    that file. When TLDR_GH_RECORD points to a file, GET requests go to the API and their responses are added to it.
+    In both cases, requests that would change something (e.g. updating an issue) aren't sent, which makes it safe to
+    run the scripts outside of CI.
+
+    Parameters:
+    command (list of str): the `gh api` command.
+    body (str): the request body passed to the command on standard input, if any.
+
+    Returns:
+    CompletedProcess: the (possibly recorded) result of the command.
+    """
+
+    method = command[command.index("--method") + 1] if "--method" in command else "GET"
+    endpoint = next(arg for arg in command[2:] if arg.startswith("/"))
+    key = f"{method} {endpoint}"
+    replay_file = os.environ.get(GH_REPLAY_ENV)
+    record_file = os.environ.get(GH_RECORD_ENV)
+
+    if method == "GET" and key in GH_GET_RESPONSES:
+        return GH_GET_RESPONSES[key]
+
+    if method != "GET" and (replay_file or record_file):
+        # Echo the request back like the API would, without changing anything.
+        number = endpoint.rpartition("/")[2]
+        if method == "PATCH" and number.isdigit():
+            response = {"number": int(number)}
+        else:
+            response = {"number": 0, "html_url": "", "body": None}
+        if body:
+            response.update(json.loads(body))
+        for index, arg in enumerate(command[:-1]):
+            if arg == "-f":
+                field, _, value = command[index + 1].partition("=")
+                response[field] = value
+        result = subprocess.CompletedProcess(command, 0, json.dumps(response), "")
+        update_gh_responses(method, endpoint, result)
+        return result
+
+    if replay_file:
+        responses = load_gh_responses(Path(replay_file))
+        if key not in responses:
+            return subprocess.CompletedProcess(
+                command, 1, "", f"No recorded response for {key}"
+            )
+        result = subprocess.CompletedProcess(command, 0, json.dumps(responses[key]), "")
+    else:
+        result = subprocess.run(command, input=body, capture_output=True, text=True)
+
+    if method != "GET":
+        update_gh_responses(method, endpoint, result)
+    elif result.returncode == 0:
+        GH_GET_RESPONSES[key] = result
+
+    if record_file and result.returncode == 0:
+        responses = load_gh_responses(Path(record_file))
+        responses[key] = json.loads(result.stdout)
+        with Path(record_file).open("w", encoding="utf-8") as f:
+            json.dump(responses, f, indent=2)
+
+    return result
+
+
 def create_github_issue(title: str) -> dict:
     command = [
         "gh",
@@ -126,7 +349,7 @@ def create_github_issue(title: str) -> dict:
         f"title={title}",
     ]
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    result = run_gh_api(command)
     data = json.loads(result.stdout)
 
     return {
@@ -148,7 +371,7 @@ def get_github_issue(title: str = None) -> list[dict]:
         "/repos/tldr-pages/tldr-maintenance/issues?per_page=100",
     ]
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    result = run_gh_api(command)
     data = json.loads(result.stdout)
 
     simplified_data = [
@@ -199,9 +422,7 @@ def update_github_issue(issue_number, title, body):
         "-",
     ]
 
-    result = subprocess.run(
-        command, input=json.dumps(payload), capture_output=True, text=True
-    )
+    result = run_gh_api(command, body=json.dumps(payload))
 
     if result.returncode != 0:
         print(
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that builds the translation coverage of every English page in every language as bitsets, so coverage
+per language and platform, and the pages missing or outdated in many languages, are a few bitwise operations.
+"""
+
+from pathlib import Path
+import os
+
+from _common import get_check_pages_dir, get_locale, get_topic_files
+
+OUTDATED_TOPICS = {
+    "count": "based-on-command-count",
+    "contents": "based-on-command-contents",
+    "header": "based-on-header-line-count",
+}
+
+
+def get_pages(pages_dir: Path) -> list[str]:
+    """
+    Get the pages of a pages directory.
+
+    Returns:
+    list (list of str): the pages relative to the directory, e.g. "common/tar.md".
+    """
+
+    return [
+        os.path.relpath(os.path.join(root, file), pages_dir)
+        for root, _, files in os.walk(pages_dir)
+        for file in files
+        if file.endswith(".md")
+    ]
+
+
+def to_bitset(page_ids, size: int) -> int:
+    """
+    Build a bitset from page IDs, through a bytearray since setting bits one by one in an integer copies it each time.
+    """
+
+    bits = bytearray((size + 7) // 8)
+    for page_id in page_ids:
+        bits[page_id >> 3] |= 1 << (page_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def get_page_ids(bitset: int):
+    """
+    Get the IDs of the pages in a bitset, in order.
+    """
+
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        while byte:
+            lowest = byte & -byte
+            yield byte_index * 8 + lowest.bit_length() - 1
+            byte ^= lowest
+
+
+class BitSlicedCounter:
+    """
+    Count, for every page at once, in how many bitsets the page is set.
+
+    The count of every page is stored in binary over the planes: bit `p` of `planes[i]` is bit `i` of the count of
+    page `p`. Adding a bitset is a ripple-carry addition over the planes.
+    """
+
+    def __init__(self):
+        self.planes = []
+
+    def add(self, bitset: int):
+        carry = bitset
+        for index, plane in enumerate(self.planes):
+            if not carry:
+                return
+            self.planes[index] = plane ^ carry
+            carry &= plane
+        if carry:
+            self.planes.append(carry)
+
+    def greater_than(self, threshold: int, all_pages: int) -> int:
+        """
+        Get the pages with a count greater than the threshold, comparing from the most significant plane.
+        """
+
+        if threshold >> len(self.planes):
+            return 0
+
+        greater = 0
+        equal = all_pages
+        for index in reversed(range(len(self.planes))):
+            plane = self.planes[index]
+            if threshold >> index & 1:
+                equal &= plane
+            else:
+                greater |= equal & plane
+                equal &= ~plane
+        return greater
+
+    def get_count(self, page_id: int) -> int:
+        return sum(
+            (plane >> page_id & 1) << index for index, plane in enumerate(self.planes)
+        )
+
+
+class CoverageMatrix:
+    """
+    The coverage of the English pages in every language.
+
+    Every English page has a dense ID, its bit in the bitsets (Python integers). Per language there is a bitset of the
+    translated pages and one per kind of outdated translation.
+    """
+
+    def __init__(self, english_pages: list[str]):
+        self.pages = sorted(english_pages)
+        self.page_ids = {page: page_id for page_id, page in enumerate(self.pages)}
+        self.all_pages = (1 << len(self.pages)) - 1
+
+        platform_pages = {}
+        for page_id, page in enumerate(self.pages):
+            platform_pages.setdefault(page.split("/", 1)[0], []).append(page_id)
+        self.platforms = {
+            platform: to_bitset(page_ids, len(self.pages))
+            for platform, page_ids in sorted(platform_pages.items())
+        }
+
+        self.present = {}
+        self.outdated = {}
+
+    def to_bitset(self, pages) -> int:
+        page_ids = (self.page_ids[page] for page in pages if page in self.page_ids)
+        return to_bitset(page_ids, len(self.pages))
+
+    def add_locale(self, locale: str, pages: list[str], outdated: dict[str, list]):
+        """
+        Add the pages of a language.
+
+        Parameters:
+        locale (str): the language.
+        pages (list of str): the translated pages, e.g. "common/tar.md".
+        outdated (dict): the outdated pages per kind of outdated translation (see OUTDATED_TOPICS).
+        """
+
+        self.present[locale] = self.to_bitset(pages)
+        self.outdated[locale] = {
+            kind: self.to_bitset(outdated.get(kind, ())) for kind in OUTDATED_TOPICS
+        }
+
+    def get_outdated(self, locale: str) -> int:
+        outdated = 0
+        for bitset in self.outdated[locale].values():
+            outdated |= bitset
+        return outdated
+
+    def get_coverage(self, locale: str, mask: int = None) -> tuple[int, int, int]:
+        """
+        Get the coverage of a language.
+
+        Parameters:
+        locale (str): the language.
+        mask (int): only count these pages (e.g. the pages of a platform), by default all pages.
+
+        Returns:
+        tuple (int, int, int): the number of pages, translated pages and translated pages that are up to date.
+        """
+
+        if mask is None:
+            mask = self.all_pages
+        present = self.present[locale] & mask
+        up_to_date = present & ~self.get_outdated(locale)
+        return mask.bit_count(), present.bit_count(), up_to_date.bit_count()
+
+    def get_untranslated(self) -> int:
+        """
+        Get the pages that aren't translated in any language.
+        """
+
+        translated = 0
+        for present in self.present.values():
+            translated |= present
+        return self.all_pages & ~translated
+
+    def get_outdated_counter(self) -> BitSlicedCounter:
+        counter = BitSlicedCounter()
+        for locale in self.outdated:
+            counter.add(self.get_outdated(locale))
+        return counter
+
+    def get_pages(self, bitset: int) -> list[str]:
+        return [self.pages[page_id] for page_id in get_page_ids(bitset)]
+
+
+def read_pages_list(path: Path, dirname: str) -> list[str]:
+    """
+    Read a check-pages file of pages, e.g. "pages.fr/common/tar.md", as pages relative to their directory.
+    """
+
+    if not path.is_file():
+        return []
+    prefix = f"{dirname}/"
+    with path.open(encoding="utf-8") as f:
+        return [line.strip().removeprefix(prefix) for line in f if line.strip()]
+
+
+def build_coverage_matrix(root: Path) -> CoverageMatrix:
+    """
+    Build the coverage matrix of a metrics run.
+
+    Parameters:
+    root (Path): the directory with the tldr repository and the check-pages directories.
+
+    Returns:
+    CoverageMatrix: the coverage of every language, or None when the tldr repository isn't there.
+    """
+
+    tldr_root = root / "tldr"
+    if not (tldr_root / "pages").is_dir():
+        return None
+
+    matrix = CoverageMatrix(get_pages(tldr_root / "pages"))
+
+    for check_pages_dir in get_check_pages_dir(root):
+        locale = get_locale(check_pages_dir)
+        dirname = f"pages.{locale}"
+        if locale == "en" or not (tldr_root / dirname).is_dir():
+            continue
+
+        topic_files = {
+            topic: filename for filename, topic in get_topic_files(locale).items()
+        }
+        outdated = {
+            kind: read_pages_list(check_pages_dir / topic_files[topic], dirname)
+            for kind, topic in OUTDATED_TOPICS.items()
+        }
+        matrix.add_locale(locale, get_pages(tldr_root / dirname), outdated)
+
+    return matrix
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that indexes when every page of the tldr repository was last changed, from a single pass over the git
+history, so translations can be compared with their English page without running git once per page.
+"""
+
+from pathlib import Path
+import os
+import json
+import tempfile
+import subprocess
+
+INDEX_VERSION = 1
+
+DAY = 24 * 60 * 60
+
+# Every commit starts with a NUL byte, which can't be part of a path.
+COMMIT_MARKER = "\0"
+
+
+def git_log(tldr_root: Path, revisions: str):
+    """
+    Stream the commits of a range of the history, oldest first.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+    revisions (str): the revision range, e.g. "HEAD" or "<commit>..HEAD".
+
+    Returns:
+    generator: the hash, commit timestamp and changed pages of every commit.
+    """
+
+    process = subprocess.Popen(
+        [
+            "git",
+            "-c",
+            "core.quotePath=false",
+            "-C",
+            str(tldr_root),
+            "log",
+            "--reverse",
+            "--name-only",
+            "--no-renames",
+            "--format=%x00%H %ct",
+            revisions,
+            "--",
+            "pages*",
+        ],
+        stdout=subprocess.PIPE,
+        encoding="utf-8",
+        errors="surrogateescape",
+    )
+
+    commit = None
+    with process.stdout:
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(COMMIT_MARKER):
+                if commit:
+                    yield commit
+                sha, timestamp = line[1:].split(" ")
+                commit = (sha, int(timestamp), [])
+            elif line and commit:
+                commit[2].append(line)
+        if commit:
+            yield commit
+
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+
+
+def get_head(tldr_root: Path) -> str:
+    return subprocess.run(
+        ["git", "-C", str(tldr_root), "rev-parse", "HEAD"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+def is_shallow(tldr_root: Path) -> bool:
+    return (
+        subprocess.run(
+            ["git", "-C", str(tldr_root), "rev-parse", "--is-shallow-repository"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        == "true"
+    )
+
+
+def is_ancestor(tldr_root: Path, commit: str, head: str) -> bool:
+    return (
+        subprocess.run(
+            ["git", "-C", str(tldr_root), "merge-base", "--is-ancestor", commit, head],
+            capture_output=True,
+        ).returncode
+        == 0
+    )
+
+
+def update_index(tldr_root: Path, index: dict = None) -> dict:
+    """
+    Index the last change of every page, extending an index from its last indexed commit.
+
+    The commits changing pages are numbered from the oldest, so the number of commits between two changes is the
+    difference of their numbers. When the indexed commit isn't part of the history anymore (e.g. after a force push),
+    the index is built again from scratch.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+    index (dict): the index to extend, or None to build it.
+
+    Returns:
+    dict: the index, with the commit number, commit timestamp and commit of the last change of every page.
+    """
+
+    head = get_head(tldr_root)
+    if (
+        not index
+        or index.get("version") != INDEX_VERSION
+        or not is_ancestor(tldr_root, index["head"], head)
+    ):
+        index = {"version": INDEX_VERSION, "head": None, "commits": 0, "paths": {}}
+
+    if index["head"] == head:
+        return index
+
+    revisions = f"{index['head']}..{head}" if index["head"] else head
+
+    paths = index["paths"]
+    # The commits are streamed oldest first, so the last change seen of a page is its last one.
+    for sha, timestamp, changed_paths in git_log(tldr_root, revisions):
+        index["commits"] += 1
+        for path in changed_paths:
+            paths[path] = [index["commits"], timestamp, sha]
+
+    index["head"] = head
+    return index
+
+
+def load_index(path: Path) -> dict:
+    if not path.exists():
+        return None
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_index(path: Path, index: dict):
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        json.dump(index, f, separators=(",", ":"), sort_keys=True)
+    os.replace(f.name, path)
+
+
+def get_english_page(page: str) -> str:
+    """
+    Get the English page of a translation, e.g. "pages/common/tar.md" for "pages.fr/common/tar.md".
+    """
+
+    dirname, _, rest = page.partition("/")
+    return f"pages/{rest}" if dirname.startswith("pages.") else page
+
+
+def get_staleness(index: dict, page: str) -> tuple[int, int]:
+    """
+    Get how much later the English page of a translation changed.
+
+    Parameters:
+    index (dict): the freshness index.
+    page (str): the translated page, e.g. "pages.fr/common/tar.md".
+
+    Returns:
+    tuple (int, int): the days and commits the English page changed after the translation, or None when it didn't
+    change since or either page isn't indexed.
+    """
+
+    translation = index["paths"].get(page)
+    english = index["paths"].get(get_english_page(page))
+    if not translation or not english or english[0] <= translation[0]:
+        return None
+    # Commit timestamps aren't always in order, e.g. for rebased commits.
+    return max(english[1] - translation[1], 0) // DAY, english[0] - translation[0]
+
+
+def get_staleness_sort_key(staleness: tuple[int, int]) -> tuple[int, int]:
+    """
+    Get the sort key of a staleness, so the pages whose English page changed the most days and then the most commits
+    later come first, and the pages without staleness (None) last.
+    """
+
+    if staleness is None:
+        return 1, 0
+    days, commits = staleness
+    return -days, -commits
+
+
+def format_staleness(staleness: tuple[int, int]) -> str:
+    days, commits = staleness
+    return f"English changed {days} day(s) and {commits} commit(s) later"
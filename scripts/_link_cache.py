@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that keeps track of the last known status of every link in the tldr pages, so the link check only has
+to check links that are failing or haven't been checked recently.
+"""
+
+from pathlib import Path
+import os
+import re
+import json
+import zlib
+import tempfile
+import ipaddress
+import urllib.parse
+
+LINK_PATTERN = re.compile(r"^>.*<(https?://[^>\s]+)>")
+
+DAY = 24 * 60 * 60
+
+# How long a status stays valid, in seconds. Failing links are checked on every run.
+STATUS_CLASS_TTLS = {
+    "ok": 7 * DAY,
+    "3xx": 1 * DAY,
+    "4xx": 0,
+    "5xx": 0,
+    "Timeout": 0,
+    "Other errors": 0,
+}
+
+
+def get_status_class(error_info: str) -> str:
+    """
+    Get the status class of a lychee status.
+
+    Parameters:
+    error_info (str): the status lychee reported for a link, e.g. "404" or "TIMEOUT".
+
+    Returns:
+    str: the status class, e.g. "4xx", "Timeout" or "Other errors".
+    """
+
+    if error_info == "ok":
+        return "ok"
+    if error_info[:3].isdigit():
+        return f"{error_info[0]}xx"
+    if error_info.startswith("TIMEOUT"):
+        return "Timeout"
+    return "Other errors"
+
+
+def collect_links(tldr_root: Path) -> dict[str, list[str]]:
+    """
+    Collect the links in the header of every page, in every language.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+
+    Returns:
+    dict: the pages (e.g. "pages.fr/common/tar.md") using each link, sorted by link.
+    """
+
+    links = {}
+    for pages_dir in sorted(tldr_root.glob("pages*")):
+        for page in sorted(pages_dir.rglob("*.md")):
+            page_name = str(page.relative_to(tldr_root))
+            with page.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.startswith(">"):
+                        if line.startswith("`"):
+                            # The header is over once the first command starts.
+                            break
+                        continue
+                    if match := LINK_PATTERN.match(line):
+                        links.setdefault(match.group(1), []).append(page_name)
+
+    return dict(sorted(links.items()))
+
+
+def load_exclude_patterns(path: Path) -> list[re.Pattern]:
+    """
+    Load the patterns of the links lychee excludes, one regular expression per line like lychee reads them.
+    """
+
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [
+            re.compile(line.strip())
+            for line in f
+            if line.strip() and not line.startswith("#")
+        ]
+
+
+def is_excluded(url: str, patterns: list[re.Pattern]) -> bool:
+    """
+    Check if lychee skips a link, because it matches an exclude pattern or (with --exclude-all-private) points to a
+    private, link-local or loopback address.
+    """
+
+    if any(pattern.search(url) for pattern in patterns):
+        return True
+
+    host = urllib.parse.urlsplit(url).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return address.is_private or address.is_link_local or address.is_loopback
+
+
+def lookup(mapping: dict, url: str):
+    """
+    Look up a link, allowing for a trailing slash added or removed by lychee.
+    """
+
+    for candidate in (url, url + "/", url.rstrip("/")):
+        if candidate in mapping:
+            return mapping[candidate]
+    return None
+
+
+def load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)["links"]
+
+
+def save_cache(path: Path, cache: dict):
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        json.dump({"version": 1, "links": cache}, f, indent=1, sort_keys=True)
+    os.replace(f.name, path)
+
+
+def is_fresh(url: str, record: dict, now: int) -> bool:
+    """
+    Check if the cached status of a link is still valid.
+
+    Parameters:
+    url (str): the link.
+    record (dict): the cached status of the link.
+    now (int): the current time as a Unix timestamp.
+
+    Returns:
+    bool: True if the link doesn't need to be checked again.
+    """
+
+    ttl = STATUS_CLASS_TTLS.get(record["class"], 0)
+    if ttl == 0:
+        return False
+
+    # Spread the expiry over half a TTL, so links checked in the same run aren't all checked again in the same run.
+    ttl += zlib.crc32(url.encode()) % (ttl // 2)
+    return now - record["checked"] < ttl
+
+
+def select_links_to_check(links: dict, cache: dict, now: int) -> list[str]:
+    return [
+        url for url in links if url not in cache or not is_fresh(url, cache[url], now)
+    ]
+
+
+def prune_cache(cache: dict, links: dict) -> dict:
+    return {url: record for url, record in cache.items() if url in links}
+
+
+def update_cache(cache: dict, failures, now: int, checked=()):
+    """
+    Record the results of a link check.
+
+    Parameters:
+    cache (dict): the cached statuses, updated in place.
+    failures (iterable of tuple (str, str)): the URL and lychee status of each failing link.
+    now (int): the time of the check as a Unix timestamp.
+    checked (iterable of str): the links known to be checked, recorded as ok unless they failed. Only give them when
+    lychee finished and skipped none of them, otherwise only the failures are recorded.
+    """
+
+    for url in checked:
+        cache[url] = {"status": "ok", "class": "ok", "checked": now}
+
+    for url, status in failures:
+        # Allow for a trailing slash added or removed by lychee, like lookup.
+        candidates = [url, url.removesuffix("/"), url + "/"]
+        target = next(
+            (
+                candidate
+                for candidate in candidates
+                if candidate in cache and cache[candidate]["checked"] == now
+            ),
+            next((candidate for candidate in candidates if candidate in cache), url),
+        )
+        cache[target] = {
+            "status": status,
+            "class": get_status_class(status),
+            "checked": now,
+        }
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that holds the rules of every locale in one place: the supported platforms, the "See also" prefix from
+the translation template of tldr, and the tldr-lint checks to ignore.
+"""
+
+from pathlib import Path
+
+PLATFORMS = [
+    "android",
+    "common",
+    "linux",
+    "openbsd",
+    "freebsd",
+    "netbsd",
+    "osx",
+    "sunos",
+    "windows",
+    "cisco-ios",
+    "dos",
+]
+
+TEMPLATES_DIR = Path("contributing-guides/translation-templates")
+SEE_ALSO_TEMPLATE = TEMPLATES_DIR / "see-also-mentions.md"
+
+# The tldr-lint checks ignored for every translation, and in addition for some locales (e.g. the ones without
+# capital letters or with a different full stop).
+LINT_IGNORED_CHECKS = ["TLDR104"]
+LOCALE_LINT_IGNORED_CHECKS = {
+    **dict.fromkeys(
+        ["ar", "bn", "fa", "hi", "ja", "ko", "lo", "ml", "ne", "ta", "th", "tr"],
+        ["TLDR003", "TLDR004", "TLDR015"],
+    ),
+    **dict.fromkeys(["zh_TW", "zh"], ["TLDR003", "TLDR004", "TLDR005", "TLDR015"]),
+}
+
+
+def parse_template(path: Path, separator: str) -> dict[str, str]:
+    """
+    Get the prefix of the example line of every locale in a translation template.
+
+    Parameters:
+    path (Path): the template, with a "### <locale>" heading and a "> ..." example line per locale.
+    separator (str): where the prefix ends on the example line, e.g. "`" for "> See also: `command1`".
+
+    Returns:
+    dict: the prefix (e.g. "> See also: ") per locale.
+    """
+
+    prefixes = {}
+    locale = None
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if locale is None:
+                if "###" in line:
+                    locale = line.split(" ")[1] if " " in line else line
+            elif ">" in line:
+                prefixes[locale] = line.split(separator)[0]
+                locale = None
+            elif line == "---":
+                locale = None
+    return prefixes
+
+
+def get_lint_ignored_checks(locale: str) -> list[str]:
+    if locale == "en":
+        return []
+    return LINT_IGNORED_CHECKS + LOCALE_LINT_IGNORED_CHECKS.get(locale, [])
+
+
+def build_rules(tldr_root: Path) -> dict:
+    """
+    Build the rules of every locale from the template.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+
+    Returns:
+    dict: the "See also" prefix and ignored lint checks per locale.
+    """
+
+    see_also_prefixes = {}
+    if (tldr_root / SEE_ALSO_TEMPLATE).exists():
+        see_also_prefixes = parse_template(tldr_root / SEE_ALSO_TEMPLATE, "`")
+
+    # Locales without an example in the template get their rules from LocaleRules.get.
+    locales = {"en"} | set(see_also_prefixes)
+
+    return {
+        locale: {
+            "see_also_prefix": see_also_prefixes.get(locale),
+            "lint_ignored_checks": get_lint_ignored_checks(locale),
+        }
+        for locale in sorted(locales)
+    }
+
+
+class LocaleRules:
+    """
+    The rules of every locale.
+    """
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+
+    def get(self, locale: str) -> dict:
+        return self.rules.get(
+            locale,
+            {
+                "see_also_prefix": None,
+                "lint_ignored_checks": get_lint_ignored_checks(locale),
+            },
+        )
+
+    def get_see_also_prefix(self, locale: str) -> str:
+        return self.get(locale)["see_also_prefix"]
+
+
+_loaded_rules = {}
+
+
+def load_locale_rules(tldr_root: Path) -> LocaleRules:
+    """
+    Load the rules of every locale, parsing the template once per process.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+
+    Returns:
+    LocaleRules: the rules, shared by every caller in this process.
+    """
+
+    key = tldr_root.resolve()
+    if key not in _loaded_rules:
+        _loaded_rules[key] = LocaleRules(build_rules(tldr_root))
+    return _loaded_rules[key]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that stores the outputs of a metrics run in one SQLite archive, with every check-pages file compressed
+on its own and indexed by locale and topic, so one locale or one topic can be read without decompressing the rest.
+"""
+
+from pathlib import Path
+from fnmatch import fnmatch
+from datetime import datetime, timezone
+import os
+import zlib
+import sqlite3
+import tempfile
+
+from _common import (
+    CHECK_PAGES_TOPIC_FILES,
+    MERGED_TOPIC_FILES,
+    get_locale,
+    get_topic_files,
+)
+
+METRICS_LOG = "metrics-log.md"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    locale TEXT,
+    topic TEXT,
+    lines INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX files_locale_topic ON files (locale, topic);
+CREATE INDEX files_topic ON files (topic);
+"""
+
+# The files merged over all locales at the end of calculate-metrics.sh, with the pattern of the files of every locale.
+MERGED_FILES = {
+    MERGED_TOPIC_FILES[topic]: "*/check-pages*/" + template.replace("-{locale}", "*")
+    for topic, template in CHECK_PAGES_TOPIC_FILES.items()
+    if topic in MERGED_TOPIC_FILES
+}
+
+
+def get_archive_files(root: Path):
+    """
+    Find the files of a metrics run to archive.
+
+    Parameters:
+    root (Path): the directory calculate-metrics.sh ran in.
+
+    Returns:
+    generator: the path relative to the root, locale and topic of every file (the locale and topic are None for the
+    metrics log, the topic is None for files that aren't a topic like debug.log).
+    """
+
+    if (root / METRICS_LOG).exists():
+        yield METRICS_LOG, None, None
+
+    for check_pages_dir in sorted(root.glob("check-pages*/")):
+        file_locale = get_locale(check_pages_dir)
+        topic_files = get_topic_files(file_locale)
+        for path in sorted(check_pages_dir.iterdir()):
+            if path.is_file():
+                yield (
+                    str(path.relative_to(root)),
+                    file_locale,
+                    topic_files.get(path.name),
+                )
+
+
+def count_lines(data: bytes) -> int:
+    if not data:
+        return 0
+    return data.count(b"\n") + (not data.endswith(b"\n"))
+
+
+def build_archive(root: Path, archive: Path) -> int:
+    """
+    Archive the outputs of a metrics run, replacing the archive atomically.
+
+    Parameters:
+    root (Path): the directory calculate-metrics.sh ran in.
+    archive (Path): the archive to write.
+
+    Returns:
+    int: the number of archived files.
+    """
+
+    archive = archive.resolve()
+    with tempfile.NamedTemporaryFile(
+        dir=archive.parent, suffix=".tmp", delete=False
+    ) as f:
+        temp_archive = Path(f.name)
+
+    try:
+        connection = sqlite3.connect(temp_archive)
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute(
+                "INSERT INTO meta VALUES ('created', ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"),),
+            )
+            count = 0
+            for path, file_locale, topic in get_archive_files(root):
+                data = (root / path).read_bytes()
+                connection.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        file_locale,
+                        topic,
+                        count_lines(data),
+                        len(data),
+                        zlib.compress(data, 9),
+                    ),
+                )
+                count += 1
+        connection.execute("VACUUM")
+        connection.close()
+    except BaseException:
+        temp_archive.unlink(missing_ok=True)
+        raise
+
+    os.replace(temp_archive, archive)
+    return count
+
+
+def open_archive(archive: Path) -> sqlite3.Connection:
+    if not archive.exists():
+        raise FileNotFoundError(f"{archive} not found")
+    return sqlite3.connect(f"{archive.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def get_filter(file_locale: str = None, topic: str = None) -> tuple[str, list]:
+    conditions = []
+    parameters = []
+    if file_locale is not None:
+        conditions.append("locale = ?")
+        parameters.append(file_locale)
+    if topic is not None:
+        conditions.append("topic = ?")
+        parameters.append(topic)
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", parameters
+
+
+def list_files(
+    connection: sqlite3.Connection, file_locale: str = None, topic: str = None
+) -> list[tuple]:
+    """
+    List the archived files, without reading their contents.
+
+    Returns:
+    list (list of tuple): the path, locale, topic, number of lines and size of every matching file.
+    """
+
+    where, parameters = get_filter(file_locale, topic)
+    return connection.execute(
+        f"SELECT path, locale, topic, lines, size FROM files{where} ORDER BY path",
+        parameters,
+    ).fetchall()
+
+
+def read_files(
+    connection: sqlite3.Connection,
+    file_locale: str = None,
+    topic: str = None,
+    path: str = None,
+):
+    """
+    Read archived files, decompressing only the matching ones.
+
+    Parameters:
+    connection (Connection): the opened archive.
+    file_locale (str): only read the files of this locale.
+    topic (str): only read the files of this topic.
+    path (str): only read this file.
+
+    Returns:
+    generator: the path and contents (bytes) of every matching file.
+    """
+
+    if path is not None:
+        rows = connection.execute(
+            "SELECT path, data FROM files WHERE path = ?", (path,)
+        )
+    else:
+        where, parameters = get_filter(file_locale, topic)
+        rows = connection.execute(
+            f"SELECT path, data FROM files{where} ORDER BY path", parameters
+        )
+
+    for file_path, data in rows:
+        yield file_path, zlib.decompress(data)
+
+
+def merge_files(
+    connection: sqlite3.Connection, pattern: str, sort_key=None
+) -> list[str]:
+    """
+    Merge the lines of the files matching a pattern of calculate-metrics.sh, like `sort -u` does.
+
+    Parameters:
+    connection (sqlite3.Connection): the archive.
+    pattern (str): the pattern of the files to merge, e.g. "./check-pages.*/missing-tldr-*-pages.txt".
+    sort_key (callable): the collation key of the lines, e.g. locale.strxfrm to sort like `sort` in the current
+    locale, or None for the code point order.
+
+    Returns:
+    list (list of str): the unique lines, sorted.
+    """
+
+    lines = set()
+    for path, _, _, _, _ in list_files(connection):
+        if fnmatch(f"./{path}", pattern):
+            for _, data in read_files(connection, path=path):
+                lines.update(data.decode("utf-8").splitlines())
+    return sorted(lines, key=sort_key)
+
+
+def export_archive(
+    connection: sqlite3.Connection,
+    output_dir: Path,
+    file_locale: str = None,
+    topic: str = None,
+    sort_key=None,
+) -> list[Path]:
+    """
+    Write the archived files back, and the merged files when everything is exported.
+
+    The merged files are sorted with sort_key, see merge_files.
+
+    Returns:
+    list (list of Path): the written files.
+    """
+
+    written = []
+    for path, data in read_files(connection, file_locale, topic):
+        output_file = output_dir / path
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_bytes(data)
+        written.append(output_file)
+
+    if file_locale is None and topic is None:
+        for merged_file, pattern in MERGED_FILES.items():
+            lines = merge_files(connection, pattern, sort_key)
+            # calculate-metrics.sh removes empty files.
+            if lines:
+                output_file = output_dir / merged_file
+                output_file.write_text(
+                    "".join(f"{line}\n" for line in lines), encoding="utf-8"
+                )
+                written.append(output_file)
+
+    return written
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that implements the checks of check-pages.sh (except the linters) on pages held in memory, so the
+results can be kept up to date one page at a time.
+"""
+
+from pathlib import Path
+import os
+import re
+import tempfile
+
+from _locale_rules import PLATFORMS
+
+COMMAND_PATTERN = re.compile(r"^`[^`]+`$")
+HEADER_PATTERN = re.compile(r"^>.*$")
+TLDR_MENTION_PATTERN = re.compile(r"`tldr .*`$")
+SEE_ALSO_MENTION_PATTERN = re.compile(r"`[^`]*`")
+
+# The substitutions stripping the placeholders and arguments of a command before comparing it with English, in order.
+STRIP_COMMAND_SUBSTITUTIONS = [
+    (re.compile(r"\{\{\[([^|]*\|[^\]]*)\]\}\}"), r"___\1___"),
+    (re.compile(r"\{\{(?:[^}]|\{[^}]*\})*\}\}"), "{{}}"),
+    (re.compile(r"<[^>]*>"), ""),
+    (re.compile(r"\([^)]*\)"), ""),
+    (re.compile(r'"[^"]*"'), '""'),
+    (re.compile(r"'[^']*'"), ""),
+    (re.compile(r"`"), ""),
+    (re.compile(r"___(.*)___"), r"{{[\1]}}"),
+]
+
+# The output file of every check, as written by check-pages.sh.
+CHECK_FILES = {
+    "missing_tldr_page": "missing-tldr{suffix}-pages.txt",
+    "orphaned_page": "orphaned{suffix}-pages.txt",
+    "misplaced_page": "misplaced{suffix}-pages.txt",
+    "outdated_page_command_contents": "outdated{suffix}-pages-based-on-command-contents.txt",
+    "outdated_page_command_count": "outdated{suffix}-pages-based-on-command-count.txt",
+    "outdated_page_header": "outdated{suffix}-pages-based-on-header-line-count.txt",
+    "missing_english_page": "missing-english{suffix}-pages.txt",
+    "missing_translated_page": "missing-translated{suffix}-pages.txt",
+}
+
+
+def get_pages_dirname(locale: str) -> str:
+    return "pages" if locale == "en" else f"pages.{locale}"
+
+
+def get_output_dir(locale: str) -> Path:
+    return Path("check-pages" if locale == "en" else f"check-pages.{locale}")
+
+
+def get_check_file(check: str, locale: str) -> Path:
+    suffix = "" if locale == "en" else f"-{locale}"
+    return get_output_dir(locale) / CHECK_FILES[check].format(suffix=suffix)
+
+
+def get_tldr_mention(line: str) -> str:
+    """
+    Get the command referenced by a `tldr <command>` mention on a line.
+
+    Parameters:
+    line (str): a line of a page.
+
+    Returns:
+    str: the referenced command as page name (e.g. "git-commit"), or None if there is no (checkable) mention.
+    """
+
+    match = TLDR_MENTION_PATTERN.search(line)
+    if not match:
+        return None
+
+    command = match.group(0)[len("`tldr ") : -1]
+    command = re.sub(r"(.*) -[^ ] [^ ]+", r"\1", command, count=1)  # "wget -p common"
+    command = re.sub(r"-[^ ] [^ ]+ (.*)", r"\1", command, count=1)  # "-p linux awk"
+    command = command.replace(" ", "-")
+
+    # Exclude -p / -u / -o (tldr -u) commands and {{commands}}.
+    if re.match(r"-\S", command) or re.search(r"\{\{.*\}\}", command):
+        return None
+    return command
+
+
+def get_see_also_mentions(line: str) -> list[str]:
+    """
+    Get the commands mentioned on a "See also" line.
+
+    Parameters:
+    line (str): the "See also" line of a page.
+
+    Returns:
+    list (list of str): the mentioned commands as page names.
+    """
+
+    return [
+        command
+        for mention in SEE_ALSO_MENTION_PATTERN.findall(line)
+        if (command := mention.strip("`").replace(" ", "-"))
+    ]
+
+
+def strip_command(command: str) -> str:
+    for pattern, replacement in STRIP_COMMAND_SUBSTITUTIONS:
+        command = pattern.sub(replacement, command)
+    return command
+
+
+class PageInfo:
+    """
+    The parts of a page the checks look at.
+    """
+
+    def __init__(self, text: str, see_also_prefix: str):
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+
+        commands = [line for line in lines if COMMAND_PATTERN.match(line)]
+        self.command_count = len(commands)
+        self.stripped_commands = " ".join(strip_command(line) for line in commands)
+        self.header_count = sum(1 for line in lines if HEADER_PATTERN.match(line))
+
+        self.mentions = [
+            command for line in lines if (command := get_tldr_mention(line))
+        ]
+        self.see_also_mentions = []
+        if see_also_prefix:
+            see_also_line = next(
+                (line for line in lines if line.startswith(see_also_prefix)), None
+            )
+            if see_also_line is not None:
+                self.see_also_mentions = get_see_also_mentions(see_also_line)
+
+
+class LocalePages:
+    """
+    The pages of one locale, indexed by their path relative to the tldr root (e.g. "pages.fr/common/tar.md").
+    """
+
+    def __init__(self, tldr_root: Path, locale: str, see_also_prefix: str):
+        self.tldr_root = tldr_root
+        self.locale = locale
+        self.dirname = get_pages_dirname(locale)
+        self.see_also_prefix = see_also_prefix
+        self.pages = {}
+        self.names = {}
+
+    def load(self):
+        self.pages = {}
+        self.names = {}
+        for root, _, files in os.walk(self.tldr_root / self.dirname):
+            for file in files:
+                if file.endswith(".md"):
+                    path = Path(root) / file
+                    self.update(str(path.relative_to(self.tldr_root)))
+
+    def update(self, page: str) -> bool:
+        """
+        Read a page again, or forget it when it no longer exists.
+
+        Parameters:
+        page (str): the path of the page relative to the tldr root.
+
+        Returns:
+        bool: True if the page was created or removed.
+        """
+
+        existed = page in self.pages
+        try:
+            text = (self.tldr_root / page).read_text(encoding="utf-8", errors="replace")
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            if existed:
+                del self.pages[page]
+                platform, name = get_platform_and_name(page)
+                self.names[name].discard(platform)
+            return existed
+
+        self.pages[page] = PageInfo(text, self.see_also_prefix)
+        if not existed:
+            platform, name = get_platform_and_name(page)
+            self.names.setdefault(name, set()).add(platform)
+        return not existed
+
+    def exists(self, name: str) -> bool:
+        return any(platform in PLATFORMS for platform in self.names.get(name, ()))
+
+
+def get_platform_and_name(page: str) -> tuple[str, str]:
+    path = Path(page)
+    return path.parent.name, path.stem
+
+
+def to_locale_page(page: str, locale: str) -> str:
+    _, rest = page.split("/", 1)
+    return f"{get_pages_dirname(locale)}/{rest}"
+
+
+class PageChecks:
+    """
+    The results of the checks for one locale, kept per page so they can be updated one page at a time.
+    """
+
+    def __init__(self, pages: LocalePages, english: LocalePages):
+        self.pages = pages
+        self.english = english
+        self.locale = pages.locale
+        self.results = {check: {} for check in CHECK_FILES}
+        # Which pages mention a command, to recheck them when the page of that command is created or removed.
+        self.mentioned_by = {}
+        self.mentions = {}
+
+    def check_all(self):
+        self.results = {check: {} for check in CHECK_FILES}
+        self.mentioned_by = {}
+        self.mentions = {}
+        for page in self.pages.pages:
+            self.check_page(page)
+        if self.locale != "en":
+            for english_page in self.english.pages:
+                self.check_translated(english_page)
+
+    def set_result(self, check: str, key: str, lines: list[str]):
+        if lines:
+            self.results[check][key] = lines
+        else:
+            self.results[check].pop(key, None)
+
+    def check_page(self, page: str):
+        """
+        Run the checks of a page of this locale, replacing its previous results.
+        """
+
+        info = self.pages.pages.get(page)
+        platform, _ = get_platform_and_name(page)
+
+        previous_mentions = self.mentions.pop(page, set())
+        for name in previous_mentions:
+            self.mentioned_by[name].discard(page)
+
+        missing = []
+        if info is not None:
+            mentions = info.mentions + info.see_also_mentions
+            self.mentions[page] = {command.lower() for command in mentions}
+            for name in self.mentions[page]:
+                self.mentioned_by.setdefault(name, set()).add(page)
+
+            for command in mentions:
+                if not self.pages.exists(command.lower()):
+                    missing.append(
+                        f"{command} does not exist yet! Command referenced in {page}"
+                    )
+        self.set_result("missing_tldr_page", page, missing)
+
+        # Only the pages of the commands this page stopped or started mentioning can change of orphaned state.
+        self.check_orphaned(page)
+        for name in previous_mentions ^ self.mentions.get(page, set()):
+            for other_platform in self.pages.names.get(name, ()):
+                self.check_orphaned(f"{self.pages.dirname}/{other_platform}/{name}.md")
+
+        misplaced = info is not None and platform not in f" {' '.join(PLATFORMS)} "
+        self.set_result("misplaced_page", page, [page] if misplaced else [])
+
+        if self.locale == "en":
+            return
+
+        english_info = self.english.pages.get(to_locale_page(page, "en"))
+        outdated_count = outdated_contents = outdated_header = False
+        if info is not None and english_info is not None:
+            if english_info.command_count != info.command_count:
+                outdated_count = True
+            elif english_info.stripped_commands != info.stripped_commands:
+                outdated_contents = True
+            outdated_header = english_info.header_count != info.header_count
+        self.set_result("outdated_page_command_count", page, [page] * outdated_count)
+        self.set_result(
+            "outdated_page_command_contents", page, [page] * outdated_contents
+        )
+        self.set_result("outdated_page_header", page, [page] * outdated_header)
+
+        missing_english = info is not None and english_info is None
+        self.set_result("missing_english_page", page, [page] * missing_english)
+
+    def check_orphaned(self, page: str):
+        """
+        Check if no other page of this locale mentions the command of a page on a supported platform, like
+        scripts/_reference_graph.py does.
+        """
+
+        parts = Path(page).parts
+        orphaned = (
+            page in self.pages.pages
+            and len(parts) == 3
+            and parts[1] in PLATFORMS
+            and not self.mentioned_by.get(Path(page).stem, set()) - {page}
+        )
+        self.set_result("orphaned_page", page, [page] * orphaned)
+
+    def check_translated(self, english_page: str):
+        page = to_locale_page(english_page, self.locale)
+        missing = english_page in self.english.pages and page not in self.pages.pages
+        self.set_result("missing_translated_page", english_page, [page] * missing)
+
+    def recheck(self, changed: dict[str, bool]):
+        """
+        Rerun the checks affected by pages that changed. The pages must already be updated in their LocalePages.
+
+        Parameters:
+        changed (dict): the changed pages (of this locale or English) relative to the tldr root, with whether they
+        were created or removed.
+        """
+
+        to_check = set()
+        for page, created_or_removed in changed.items():
+            if page.startswith(self.pages.dirname + "/"):
+                if created_or_removed:
+                    _, name = get_platform_and_name(page)
+                    to_check.update(self.mentioned_by.get(name.lower(), ()))
+                to_check.add(page)
+                if self.locale != "en":
+                    self.check_translated(to_locale_page(page, "en"))
+            elif page.startswith(self.english.dirname + "/"):
+                to_check.add(to_locale_page(page, self.locale))
+                self.check_translated(page)
+
+        for page in to_check:
+            self.check_page(page)
+
+    def get_lines(self, check: str) -> list[str]:
+        # Sorted by code point, which is the byte order `LC_ALL=C sort` uses in check-pages.sh.
+        return sorted(line for lines in self.results[check].values() for line in lines)
+
+    def get_page_results(self, page: str) -> dict[str, list[str]]:
+        results = {}
+        for check, pages in self.results.items():
+            key = (
+                to_locale_page(page, "en")
+                if check == "missing_translated_page"
+                else page
+            )
+            if key in pages:
+                results[check] = pages[key]
+        return results
+
+
+def write_check_file(path: Path, lines: list[str]) -> bool:
+    """
+    Write the lines of a check to its output file, unless they didn't change.
+
+    Returns:
+    bool: True if the file was written.
+    """
+
+    content = "".join(f"{line}\n" for line in lines)
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        f.write(content)
+    os.replace(f.name, path)
+    return True
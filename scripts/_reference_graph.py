@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that builds the graph of the references between pages (the `tldr <command>` and "See also" mentions), in
+every language in one pass, to find the referenced commands without a page and the pages nobody references.
+"""
+
+from pathlib import Path
+from array import array
+import os
+
+from _locale_rules import PLATFORMS, load_locale_rules
+from _page_checks import (
+    get_pages_dirname,
+    get_tldr_mention,
+    get_see_also_mentions,
+)
+
+TLDR_MENTIONS = "tldr"
+SEE_ALSO_MENTIONS = "see-also"
+MENTION_KINDS = [TLDR_MENTIONS, SEE_ALSO_MENTIONS]
+
+
+def get_mentions(path: Path, see_also_prefix: str) -> list[tuple[str, str]]:
+    """
+    Get the mentions of a page, like check-pages.sh finds them.
+
+    Parameters:
+    path (Path): the page.
+    see_also_prefix (str): the "See also" prefix of the language of the page, or None.
+
+    Returns:
+    list (list of tuple): the kind and command of every mention, in the order of the page.
+    """
+
+    tldr_mentions = []
+    see_also_mentions = []
+    see_also_found = not see_also_prefix
+    with path.open(encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if command := get_tldr_mention(line):
+                tldr_mentions.append((TLDR_MENTIONS, command))
+            # Only the first "See also" line counts.
+            if not see_also_found and line.startswith(see_also_prefix):
+                see_also_found = True
+                see_also_mentions = [
+                    (SEE_ALSO_MENTIONS, command)
+                    for command in get_see_also_mentions(line)
+                ]
+    return tldr_mentions + see_also_mentions
+
+
+class ReferenceGraph:
+    """
+    The references between the pages of one or more languages.
+
+    Pages and commands are numbered. A command is a name in a language (e.g. "tar" in "fr"), it exists when the
+    language has a page for it on a supported platform. The mentions are stored as compressed sparse rows: the
+    mentions of page `p` are `forward_commands[forward_offsets[p]:forward_offsets[p + 1]]`, and the pages mentioning
+    command `c` are `reverse_pages[reverse_offsets[c]:reverse_offsets[c + 1]]`.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.page_locales = []
+        self.commands = []
+        self.command_ids = {}
+        self.command_exists = bytearray()
+        # The command every page is the page of, if it is on a supported platform.
+        self.page_commands = array("i")
+
+        self.forward_offsets = array("I", [0])
+        self.forward_commands = array("I")
+        self.forward_kinds = bytearray()
+        # The mention as written (e.g. "Git commit"), only when it differs from the command name.
+        self.forward_labels = {}
+
+        self.reverse_offsets = array("I")
+        self.reverse_pages = array("I")
+
+    def get_command_id(self, locale: str, name: str) -> int:
+        key = (locale, name)
+        command_id = self.command_ids.get(key)
+        if command_id is None:
+            command_id = self.command_ids[key] = len(self.commands)
+            self.commands.append(key)
+            self.command_exists.append(0)
+        return command_id
+
+    def add_locale(self, tldr_root: Path, locale: str, see_also_prefix: str):
+        dirname = get_pages_dirname(locale)
+        paths = sorted(
+            Path(root) / file
+            for root, _, files in os.walk(tldr_root / dirname)
+            for file in files
+            if file.endswith(".md")
+        )
+
+        for path in paths:
+            page = path.relative_to(tldr_root)
+            self.pages.append(str(page))
+            self.page_locales.append(locale)
+
+            if len(page.parts) == 3 and page.parts[1] in PLATFORMS:
+                command_id = self.get_command_id(locale, page.stem)
+                self.command_exists[command_id] = 1
+                self.page_commands.append(command_id)
+            else:
+                self.page_commands.append(-1)
+
+            for kind, command in get_mentions(path, see_also_prefix):
+                command_id = self.get_command_id(locale, command.lower())
+                if command != command.lower():
+                    self.forward_labels[len(self.forward_commands)] = command
+                self.forward_commands.append(command_id)
+                self.forward_kinds.append(MENTION_KINDS.index(kind))
+            self.forward_offsets.append(len(self.forward_commands))
+
+    def build_reverse_index(self):
+        """
+        Build the pages mentioning every command from the mentions of every page, with a counting sort.
+        """
+
+        counts = array("I", bytes(4 * (len(self.commands) + 1)))
+        for command_id in self.forward_commands:
+            counts[command_id + 1] += 1
+        for command_id in range(len(self.commands)):
+            counts[command_id + 1] += counts[command_id]
+        self.reverse_offsets = array("I", counts)
+
+        self.reverse_pages = array("I", bytes(4 * len(self.forward_commands)))
+        positions = counts
+        for page_id in range(len(self.pages)):
+            for command_id in self.get_mentioned_commands(page_id):
+                self.reverse_pages[positions[command_id]] = page_id
+                positions[command_id] += 1
+
+    def get_mentioned_commands(self, page_id: int) -> array:
+        return self.forward_commands[
+            self.forward_offsets[page_id] : self.forward_offsets[page_id + 1]
+        ]
+
+    def get_referencing_pages(self, locale: str, name: str) -> list[str]:
+        """
+        Get the pages mentioning a command, once per mention.
+        """
+
+        command_id = self.command_ids.get((locale, name.lower()))
+        if command_id is None:
+            return []
+        start, end = self.reverse_offsets[command_id : command_id + 2]
+        return [self.pages[page_id] for page_id in self.reverse_pages[start:end]]
+
+    def get_missing_pages(self, locale: str, kinds: list[str] = MENTION_KINDS):
+        """
+        Get the mentions of commands without a page, in the format of check-pages.sh.
+
+        Parameters:
+        locale (str): the language of the mentioning pages.
+        kinds (list of str): the kinds of mentions to check.
+
+        Returns:
+        generator: a line per mention of a missing command, e.g. "git-commit does not exist yet! Command referenced in
+        pages.fr/common/git.md".
+        """
+
+        kind_ids = {MENTION_KINDS.index(kind) for kind in kinds}
+        for page_id, page in enumerate(self.pages):
+            if self.page_locales[page_id] != locale:
+                continue
+            start, end = self.forward_offsets[page_id : page_id + 2]
+            for index in range(start, end):
+                command_id = self.forward_commands[index]
+                if self.command_exists[command_id]:
+                    continue
+                if self.forward_kinds[index] not in kind_ids:
+                    continue
+                command = self.forward_labels.get(index, self.commands[command_id][1])
+                yield f"{command} does not exist yet! Command referenced in {page}"
+
+    def get_orphaned_pages(self, locale: str):
+        """
+        Get the pages of a language that no other page of the language mentions.
+        """
+
+        for page_id, page in enumerate(self.pages):
+            command_id = self.page_commands[page_id]
+            if self.page_locales[page_id] != locale or command_id < 0:
+                continue
+            start, end = self.reverse_offsets[command_id : command_id + 2]
+            if all(
+                referencing_page == page_id
+                for referencing_page in self.reverse_pages[start:end]
+            ):
+                yield page
+
+
+def build_reference_graph(tldr_root: Path, locales: list[str]) -> ReferenceGraph:
+    """
+    Build the reference graph of the given languages.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+    locales (list of str): the languages, e.g. ["en", "fr"].
+
+    Returns:
+    ReferenceGraph: the graph, with the reverse index built.
+    """
+
+    rules = load_locale_rules(tldr_root)
+
+    graph = ReferenceGraph()
+    for locale in locales:
+        graph.add_locale(tldr_root, locale, rules.get_see_also_prefix(locale))
+    graph.build_reverse_index()
+    return graph
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+A Python file that provides the opt-in stage instrumentation for the maintenance scripts.
+
+Tracing is enabled by setting the environment variable TLDR_TRACE_FILE to a path. Every finished stage appends one
+JSON line to that file, the same format as the `trace_begin`/`trace_end` helpers in `_trace.sh` write.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+
+TRACE_FILE_ENV = "TLDR_TRACE_FILE"
+
+
+def get_trace_file() -> Path:
+    """
+    Get the trace file from the environment.
+
+    Returns:
+    Path: the file to append the trace events to, or None when tracing is disabled.
+    """
+
+    trace_file = os.environ.get(TRACE_FILE_ENV)
+    return Path(trace_file) if trace_file else None
+
+
+def count_forks() -> int:
+    """
+    Get the number of forks since boot from /proc/stat.
+
+    The counter is system-wide, so the difference over a stage also counts the processes started by anything else
+    running on the machine at the same time. It's only an upper bound of the processes the stage started.
+
+    Returns:
+    int: the fork counter, or None when it isn't available (e.g. outside Linux).
+    """
+
+    try:
+        with open("/proc/stat", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("processes "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def cpu_time_us(usage: resource.struct_rusage) -> int:
+    return int((usage.ru_utime + usage.ru_stime) * 1_000_000)
+
+
+def write_event(
+    name: str,
+    locale: str,
+    start: int,
+    duration: int,
+    cpu: int,
+    max_rss_kb: int,
+    system_forks: int,
+    pid: int = None,
+    category: str = None,
+):
+    trace_file = get_trace_file()
+    if trace_file is None:
+        return
+
+    event = {
+        "name": name,
+        "cat": category or Path(sys.argv[0]).name,
+        "locale": locale,
+        "pid": pid or os.getpid(),
+        "ts": start,
+        "dur": duration,
+        "cpu": cpu,
+        "max_rss_kb": max_rss_kb,
+        "system_forks": system_forks,
+    }
+
+    # A single short write per event keeps concurrent appends from several processes intact.
+    with trace_file.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(event) + "\n")
+
+
+@contextmanager
+def stage(name: str, locale: str = None):
+    """
+    Measure a stage of the current process. Does nothing when tracing is disabled.
+
+    The CPU time includes waited-for subprocesses. The peak RSS is the high-water mark of this process and its
+    subprocesses at the end of the stage.
+
+    Parameters:
+    name (str): the name of the stage.
+    locale (str): the locale the stage is working on, if any.
+    """
+
+    if get_trace_file() is None:
+        yield
+        return
+
+    start = now_us()
+    start_cpu = cpu_time_us(resource.getrusage(resource.RUSAGE_SELF)) + cpu_time_us(
+        resource.getrusage(resource.RUSAGE_CHILDREN)
+    )
+    start_forks = count_forks()
+    try:
+        yield
+    finally:
+        end = now_us()
+        usage_self = resource.getrusage(resource.RUSAGE_SELF)
+        usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        end_forks = count_forks()
+
+        write_event(
+            name,
+            locale,
+            start,
+            end - start,
+            cpu_time_us(usage_self) + cpu_time_us(usage_children) - start_cpu,
+            max(usage_self.ru_maxrss, usage_children.ru_maxrss),
+            (
+                end_forks - start_forks
+                if start_forks is not None and end_forks is not None
+                else None
+            ),
+        )
+
+
+def run_command(name: str, locale: str, command: list[str]) -> int:
+    """
+    Run a command and record its wall time, CPU time, peak RSS and the system-wide fork count as a stage.
+
+    Parameters:
+    name (str): the name of the stage.
+    locale (str): the locale the command is working on, if any.
+    command (list of str): the command to run, its standard streams are inherited.
+
+    Returns:
+    int: the exit code of the command, 127 when it isn't found like in a shell.
+    """
+
+    start = now_us()
+    start_forks = count_forks()
+
+    try:
+        process = subprocess.Popen(command)
+    except FileNotFoundError:
+        print(f"{command[0]}: command not found", file=sys.stderr)
+        return 127
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    end = now_us()
+    end_forks = count_forks()
+
+    write_event(
+        name,
+        locale,
+        start,
+        end - start,
+        cpu_time_us(usage),
+        usage.ru_maxrss,
+        (
+            end_forks - start_forks
+            if start_forks is not None and end_forks is not None
+            else None
+        ),
+        pid=process.pid,
+        category=Path(command[0]).name,
+    )
+
+    return process.returncode
+
+
+def read_events(path: Path) -> list[dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def to_chrome_trace(events: list[dict]) -> dict:
+    """
+    Convert trace events to the Chrome trace-event format, viewable in Perfetto or chrome://tracing.
+
+    Parameters:
+    events (list of dict): the events as read from the trace file.
+
+    Returns:
+    dict: a trace-event JSON object with one complete ("X") event per stage.
+    """
+
+    trace_events = []
+    for event in events:
+        name = event["name"]
+        if event["locale"]:
+            name += f" [{event['locale']}]"
+
+        trace_events.append(
+            {
+                "name": name,
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": event["ts"],
+                "dur": event["dur"],
+                "pid": event["pid"],
+                "tid": event["pid"],
+                "args": {
+                    "locale": event["locale"],
+                    "cpu_ms": (
+                        event["cpu"] / 1000 if event["cpu"] is not None else None
+                    ),
+                    "max_rss_kb": event["max_rss_kb"],
+                    "system_forks": event["system_forks"],
+                },
+            }
+        )
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def is_nested(event: dict, others: list[dict]) -> bool:
+    return any(
+        other is not event
+        and other["ts"] <= event["ts"]
+        and event["ts"] + event["dur"] <= other["ts"] + other["dur"]
+        and (other["ts"], other["dur"]) != (event["ts"], event["dur"])
+        for other in others
+    )
+
+
+def aggregate(events: list[dict]) -> dict:
+    def add(total, value):
+        if value is None:
+            return total
+        return value if total is None else total + value
+
+    totals = {
+        "count": 0,
+        "wall": 0,
+        "cpu": None,
+        "max_rss_kb": None,
+        "system_forks": None,
+    }
+    for event in events:
+        totals["count"] += 1
+        totals["wall"] += event["dur"]
+        totals["cpu"] = add(totals["cpu"], event["cpu"])
+        totals["system_forks"] = add(totals["system_forks"], event["system_forks"])
+        if event["max_rss_kb"] is not None:
+            totals["max_rss_kb"] = max(totals["max_rss_kb"] or 0, event["max_rss_kb"])
+    return totals
+
+
+def format_row(label: str, totals: dict) -> str:
+    def seconds(value):
+        return f"{value / 1_000_000:.2f}" if value is not None else "-"
+
+    max_rss = (
+        f"{totals['max_rss_kb'] / 1024:.1f}"
+        if totals["max_rss_kb"] is not None
+        else "-"
+    )
+    system_forks = totals["system_forks"] if totals["system_forks"] is not None else "-"
+
+    return f"| {label} | {totals['count']} | {seconds(totals['wall'])} | {seconds(totals['cpu'])} | {max_rss} | {system_forks} |\n"
+
+
+def render_summary(events: list[dict]) -> str:
+    """
+    Render a Markdown summary of the trace events, per stage and per locale.
+
+    Parameters:
+    events (list of dict): the events as read from the trace file.
+
+    Returns:
+    str: the Markdown tables.
+    """
+
+    header = "| {} | Runs | Wall (s) | CPU (s) | Peak RSS (MiB) | Forks (system-wide) |\n|---|---|---|---|---|---|\n"
+
+    stages = {}
+    for event in events:
+        stages.setdefault((event["cat"], event["name"]), []).append(event)
+
+    markdown = "## Timings per stage\n\n"
+    markdown += header.format("Stage")
+    for (category, name), stage_events in sorted(
+        stages.items(), key=lambda item: -aggregate(item[1])["wall"]
+    ):
+        markdown += format_row(f"{category}: {name}", aggregate(stage_events))
+
+    # Only count the outermost stages of a locale, so nested stages aren't counted twice.
+    locales = {}
+    for event in events:
+        if event["locale"]:
+            locales.setdefault(event["locale"], []).append(event)
+
+    markdown += "\n## Timings per locale\n\n"
+    markdown += header.format("Locale")
+    for locale, locale_events in sorted(locales.items()):
+        outermost = [
+            event for event in locale_events if not is_nested(event, locale_events)
+        ]
+        markdown += format_row(locale, aggregate(outermost))
+
+    return markdown
@@ -0,0 +1,106 @@
+#!/usr/bin/env bash
+# SPDX-License-Identifier: MIT
+
+# Opt-in stage instrumentation for the metrics scripts, meant to be sourced.
+# Tracing is enabled by setting TLDR_TRACE_FILE to a path. Every finished stage then appends one JSON line
+# to that file, which can be turned into a Chrome trace and a summary table with ./scripts/trace-stage.py.
+# - trace_begin <stage> [locale] / trace_end measure a block of the current shell.
+#   Wall time comes from EPOCHREALTIME, CPU time from /proc/<pid>/stat (including waited-for children)
+#   and the fork count from the counter in /proc/stat, so measuring doesn't spawn processes itself.
+#   The fork counter is system-wide: it also counts the processes started by anything else running at the same time.
+# - trace_run <stage> <locale> <command...> runs an external command through trace-stage.py to also record its peak RSS.
+
+TRACE_STAGE_SCRIPT="$(dirname "${BASH_SOURCE[0]}")/trace-stage.py"
+TRACE_NAMES=()
+TRACE_LOCALES=()
+TRACE_STARTS=()
+TRACE_CPU_STARTS=()
+TRACE_FORK_STARTS=()
+
+if [ -n "$TLDR_TRACE_FILE" ]; then
+  TRACE_CLOCK_TICKS=$(getconf CLK_TCK 2> /dev/null || echo 100)
+fi
+
+# Sets TRACE_SAMPLE_TIME (µs), TRACE_SAMPLE_CPU (clock ticks) and TRACE_SAMPLE_FORKS, -1 when unavailable.
+trace_sample() {
+  local stat
+  local fields
+  local key
+  local value
+
+  TRACE_SAMPLE_CPU=-1
+  TRACE_SAMPLE_FORKS=-1
+
+  if read -r stat < "/proc/$BASHPID/stat" 2> /dev/null; then
+    # Skip "pid (comm) " so the remaining fields start at the process state.
+    read -ra fields <<< "${stat##*) }"
+    TRACE_SAMPLE_CPU=$((fields[11] + fields[12] + fields[13] + fields[14]))
+  fi
+
+  if [ -r /proc/stat ]; then
+    while read -r key value _; do
+      if [ "$key" = "processes" ]; then
+        TRACE_SAMPLE_FORKS="$value"
+        break
+      fi
+    done < /proc/stat
+  fi
+
+  TRACE_SAMPLE_TIME="${EPOCHREALTIME/[.,]/}"
+}
+
+trace_begin() {
+  if [ -z "$TLDR_TRACE_FILE" ]; then
+    return 0
+  fi
+
+  trace_sample
+
+  TRACE_NAMES+=("$1")
+  TRACE_LOCALES+=("$2")
+  TRACE_STARTS+=("$TRACE_SAMPLE_TIME")
+  TRACE_CPU_STARTS+=("$TRACE_SAMPLE_CPU")
+  TRACE_FORK_STARTS+=("$TRACE_SAMPLE_FORKS")
+}
+
+trace_end() {
+  if [ -z "$TLDR_TRACE_FILE" ] || [ ${#TRACE_NAMES[@]} -eq 0 ]; then
+    return 0
+  fi
+
+  trace_sample
+
+  local index=$((${#TRACE_NAMES[@]} - 1))
+  local locale="null"
+  local cpu="null"
+  local system_forks="null"
+
+  if [ -n "${TRACE_LOCALES[$index]}" ]; then
+    locale="\"${TRACE_LOCALES[$index]}\""
+  fi
+  if [ "$TRACE_SAMPLE_CPU" -ge 0 ] && [ "${TRACE_CPU_STARTS[$index]}" -ge 0 ]; then
+    cpu=$(((TRACE_SAMPLE_CPU - TRACE_CPU_STARTS[index]) * 1000000 / TRACE_CLOCK_TICKS))
+  fi
+  if [ "$TRACE_SAMPLE_FORKS" -ge 0 ] && [ "${TRACE_FORK_STARTS[$index]}" -ge 0 ]; then
+    system_forks=$((TRACE_SAMPLE_FORKS - TRACE_FORK_STARTS[index]))
+  fi
+
+  printf '{"name": "%s", "cat": "%s", "locale": %s, "pid": %d, "ts": %d, "dur": %d, "cpu": %s, "max_rss_kb": null, "system_forks": %s}\n' \
+    "${TRACE_NAMES[$index]}" "${0##*/}" "$locale" "$BASHPID" "${TRACE_STARTS[$index]}" \
+    "$((TRACE_SAMPLE_TIME - TRACE_STARTS[index]))" "$cpu" "$system_forks" >> "$TLDR_TRACE_FILE"
+
+  unset "TRACE_NAMES[$index]" "TRACE_LOCALES[$index]" "TRACE_STARTS[$index]" "TRACE_CPU_STARTS[$index]" "TRACE_FORK_STARTS[$index]"
+}
+
+trace_run() {
+  local stage="$1"
+  local locale="$2"
+  shift 2
+
+  if [ -z "$TLDR_TRACE_FILE" ]; then
+    "$@"
+    return
+  fi
+
+  python3 "$TRACE_STAGE_SCRIPT" run --stage "$stage" ${locale:+--locale "$locale"} -- "$@"
+}
@@ -2,18 +2,40 @@
 # SPDX-License-Identifier: MIT
 
 # This script is used by the GitHub Action `calculate-metrics`.
+# It runs the checks of every locale, then writes the report (the metrics log and the merged `*.txt` files).
+
+# Usage: ./calculate-metrics.sh [--shard index/count | --merge]
+#   - --shard (optional): only run the checks of one shard of the locales (e.g. 2/4), see scripts/shard-locales.py.
+#   - --merge (optional): only write the report, from the outputs of all shards.
+# Set TLDR_TRACE_FILE to record the timings of every stage, see scripts/_trace.sh.
+
+# shellcheck source=scripts/_trace.sh
+source "$(dirname "${BASH_SOURCE[0]}")/_trace.sh"
+
+SHARD=""
+MERGE=false
+
+while [ $# -gt 0 ]; do
+  case "$1" in
+  --shard)
+    SHARD="$2"
+    shift 2
+    ;;
+  --merge)
+    MERGE=true
+    shift
+    ;;
+  *)
+    echo "This argument is not valid for this script."
+    exit 1
+    ;;
+  esac
+done
 
-total_pages=$(find ./tldr/pages* -type f | wc -l)
-total_non_english_pages=$(find ./tldr/pages.* -type f | wc -l)
-total_english_pages=$(find ./tldr/pages -type f | wc -l)
-
-total_translation_folders=$(find ./tldr -maxdepth 1 -type d -name "pages.*" | wc -l)
-total_pages_need_translation=$((total_english_pages * total_translation_folders))
-# shellcheck disable=SC2016
-total_tldr_pages=$(find ./tldr/pages* -type f -exec grep -o '`tldr [^`]*' {} + | awk -F':' '{print $2}' | wc -l)
-total_english_pages_with_see_also_mention=$(find ./tldr/pages* -type f -exec grep -o '> See also:' {} + | awk -F':' '{print $2}' | wc -l)
-total_pages_need_see_also_mention=$((total_english_pages_with_see_also_mention * total_translation_folders))
-total_unique_non_english_pages=$(find ./tldr/pages.* -type f | awk -F/ '{print $NF}' | sort -u | wc -l)
+if [ -n "$SHARD" ] && [[ ! "$SHARD" =~ ^[0-9]+/[0-9]+$ ]]; then
+  echo "The shard must be given as index/count, e.g. 2/4."
+  exit 1
+fi
 
 EXIT_CODE=0
 
@@ -23,9 +45,9 @@ run_python_script() {
   local additional_options="$3"
 
   if [[ -n "$additional_options" ]]; then
-    ./tldr/scripts/"${script_name}.py" -Sn "$additional_options" >> "$script_name".txt
+    trace_run "$script_name $additional_options" "" ./tldr/scripts/"${script_name}.py" -Sn "$additional_options" >> "$script_name".txt
   else
-    ./tldr/scripts/"${script_name}.py" -Sn >> "$script_name".txt
+    trace_run "$script_name" "" ./tldr/scripts/"${script_name}.py" -Sn >> "$script_name".txt
   fi
 
   sed 's/\x1b\[[0-9;]*m//g' "$script_name".txt | sed "$remove_text" >> "$script_name".txt.tmp
@@ -33,16 +55,6 @@ run_python_script() {
   sort -u "$script_name".txt -o "$script_name".txt
 }
 
-run_python_script "set-more-info-link" 's/ link would be.*$//'
-run_python_script "set-see-also" 's/ see also would be.*$//'
-run_python_script "set-alias-page" 's/ page would be.*$//'
-run_python_script "set-alias-page" 's/ page would be.*$//' '-i'
-run_python_script "set-page-title" 's/ title would be.*$//'
-
-./tldr/scripts/wrong-filename.py
-
-./scripts/check-pages.sh -v
-
 count_and_display() {
   local file="$1"
   local message="$2"
@@ -70,43 +82,6 @@ grep_count_and_display() {
   count_and_display "$output_file" "$message"
 }
 
-printf "# Metrics for tldr\n\n"
-
-grep_count_and_display "pages/" "./inconsistent-filenames.txt" "./check-pages/inconsistent-filenames.txt" "inconsistent filename(s)"
-grep_count_and_display "pages.en/" "./set-more-info-link.txt" "./check-pages/malformed-more-info-link-pages.txt" "malformed more info link page(s)"
-
-count_and_display "./check-pages/missing-tldr-pages.txt" "missing TLDR page(s)"
-count_and_display "./check-pages/misplaced-pages.txt" "misplaced page(s)"
-count_and_display "./check-pages/lint-errors.txt" "linter error(s)"
-
-printf -- '_%.0s' {1..100}; echo
-
-folders=$(find ./tldr -type d -name "pages.*" | sort -u)
-for folder in $folders; do
-  folder_suffix="${folder##*/pages.}"
-
-  ./scripts/check-pages.sh -l "$folder_suffix" -v
-
-  grep_count_and_display "pages.$folder_suffix/" "./inconsistent-filenames.txt" "./check-pages.$folder_suffix/inconsistent-$folder_suffix-filenames.txt" "inconsistent filename(s)"
-  grep_count_and_display "pages.$folder_suffix/" "./set-more-info-link.txt" "./check-pages.$folder_suffix/malformed-or-outdated-more-info-link-$folder_suffix-pages.txt" "malformed or outdated more info link page(s)"
-  grep_count_and_display "pages.$folder_suffix/" "./set-see-also.txt" "./check-pages.$folder_suffix/malformed-or-outdated-see-also-mentions-$folder_suffix-pages.txt" "malformed or outdated see also mention(s)"
-  grep_count_and_display "pages.$folder_suffix/" "./set-alias-page.txt" "./check-pages.$folder_suffix/missing-$folder_suffix-alias-pages.txt" "missing alias page(s)"
-  grep_count_and_display "pages.$folder_suffix/" "./set-page-title.txt" "./check-pages.$folder_suffix/mismatched-$folder_suffix-page-titles.txt" "mismatched page title(s)"
-
-  count_and_display "./check-pages.$folder_suffix/missing-tldr-$folder_suffix-pages.txt" "missing TLDR page(s)"
-  count_and_display "./check-pages.$folder_suffix/misplaced-$folder_suffix-pages.txt" "misplaced page(s)"
-  count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-command-count.txt" "outdated page(s) based on number of commands"
-  count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-command-contents.txt" "outdated page(s) based on the commands itself"
-  count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-header-line-count.txt" "outdated page(s) based on number of header lines"
-  count_and_display "./check-pages.$folder_suffix/missing-english-$folder_suffix-pages.txt" "missing English page(s)"
-  count_and_display "./check-pages.$folder_suffix/missing-translated-$folder_suffix-pages.txt" "missing translated page(s)"
-  count_and_display "./check-pages.$folder_suffix/lint-errors-$folder_suffix.txt" "linter error(s)"
-
-  printf -- '_%.0s' {1..100}; echo
-done
-
-rm -f "./set-more-info-link.txt" "./set-see-also.txt" "./set-alias-page.txt" "./set-page-title.txt"
-
 merge_files_and_calculate_total() {
   local files_pattern="$1"
   local merge_file="$2"
@@ -150,20 +125,145 @@ calculate_and_display() {
   fi
 }
 
-calculate_and_display '*/check-pages*/inconsistent*filenames.txt' "./inconsistent-filenames.txt" "$total_pages" "inconsistent filename(s)"
-calculate_and_display '*/check-pages*/malformed-or-outdated-more-info-link*pages.txt' "./malformed-or-outdated-more-info-link-pages.txt" "$total_pages" "malformed or outdated more info link page(s)"
-calculate_and_display '*/check-pages*/malformed-or-outdated-see-also-mentions*pages.txt' "./malformed-or-outdated-see-also-mentions.txt" "$total_pages_need_see_also_mention" "malformed or outdated see also mention(s)"
-calculate_and_display '*/check-pages*/missing*alias-pages.txt' "./missing-alias-pages.txt" "" "missing alias page(s)"
-calculate_and_display '*/check-pages*/mismatched*page-titles.txt' "./mismatched-page-titles.txt" "$total_unique_non_english_pages" "mismatched page title(s)"
-calculate_and_display '*/check-pages*/missing-tldr*pages.txt' "./missing-tldr-pages.txt" "$total_tldr_pages" "missing TLDR page(s)"
-calculate_and_display '*/check-pages*/misplaced*pages.txt' "./misplaced-pages.txt" "$total_pages" "misplaced page(s)"
-calculate_and_display '*/check-pages*/outdated*pages-based-on-command-count.txt' "./outdated-pages-based-on-command-count.txt" "$total_non_english_pages" "outdated page(s) based on number of commands"
-calculate_and_display '*/check-pages*/outdated*pages-based-on-command-contents.txt' "./outdated-pages-based-on-command-contents.txt" "$total_non_english_pages" "outdated page(s) based on the commands itself"
-calculate_and_display '*/check-pages*/outdated*pages-based-on-header-line-count.txt' "./outdated-pages-based-on-header-line-count.txt" "$total_non_english_pages" "outdated page(s) based on number of header lines"
-calculate_and_display '*/check-pages*/missing-english*pages.txt' "./missing-english-pages.txt" "$total_unique_non_english_pages" "missing English page(s)"
-calculate_and_display '*/check-pages*/missing-translated*pages.txt' "./missing-translated-pages.txt" "$total_pages_need_translation" "missing translated page(s)"
-calculate_and_display '*/check-pages*/lint-errors*.txt' "./lint-errors.txt" "" "lint error(s)"
-
-find . -type f \( -path '*/check-pages*/*.txt' -o -path '*.txt' \) -size 0 -exec rm -f {} \;
+# Print the locales, English first.
+get_locales() {
+  echo "en"
+  for folder in $(find ./tldr -type d -name "pages.*" | sort -u); do
+    echo "${folder##*/pages.}"
+  done
+}
+
+# Run the checks of the given locales. English also runs the checks over the whole repository, which are split per
+# locale when writing the report.
+run_checks() {
+  local locale
+
+  for locale in "$@"; do
+    if [ "$locale" = "en" ]; then
+      run_python_script "set-more-info-link" 's/ link would be.*$//'
+      run_python_script "set-see-also" 's/ see also would be.*$//'
+      run_python_script "set-alias-page" 's/ page would be.*$//'
+      run_python_script "set-alias-page" 's/ page would be.*$//' '-i'
+      run_python_script "set-page-title" 's/ title would be.*$//'
+
+      trace_run "wrong-filename" "" ./tldr/scripts/wrong-filename.py
+
+      trace_run "check-pages" "en" ./scripts/check-pages.sh -v
+    else
+      trace_run "check-pages" "$locale" ./scripts/check-pages.sh -l "$locale" -v
+    fi
+  done
+}
+
+write_report() {
+  trace_begin "count-pages"
+
+  total_pages=$(find ./tldr/pages* -type f | wc -l)
+  total_non_english_pages=$(find ./tldr/pages.* -type f | wc -l)
+  total_english_pages=$(find ./tldr/pages -type f | wc -l)
+
+  total_translation_folders=$(find ./tldr -maxdepth 1 -type d -name "pages.*" | wc -l)
+  total_pages_need_translation=$((total_english_pages * total_translation_folders))
+  # shellcheck disable=SC2016
+  total_tldr_pages=$(find ./tldr/pages* -type f -exec grep -o '`tldr [^`]*' {} + | awk -F':' '{print $2}' | wc -l)
+  total_english_pages_with_see_also_mention=$(find ./tldr/pages* -type f -exec grep -o '> See also:' {} + | awk -F':' '{print $2}' | wc -l)
+  total_pages_need_see_also_mention=$((total_english_pages_with_see_also_mention * total_translation_folders))
+  total_unique_non_english_pages=$(find ./tldr/pages.* -type f | awk -F/ '{print $NF}' | sort -u | wc -l)
+
+  trace_end
+
+  printf "# Metrics for tldr\n\n"
+
+  grep_count_and_display "pages/" "./inconsistent-filenames.txt" "./check-pages/inconsistent-filenames.txt" "inconsistent filename(s)"
+  grep_count_and_display "pages.en/" "./set-more-info-link.txt" "./check-pages/malformed-more-info-link-pages.txt" "malformed more info link page(s)"
+
+  count_and_display "./check-pages/missing-tldr-pages.txt" "missing TLDR page(s)"
+  count_and_display "./check-pages/orphaned-pages.txt" "orphaned page(s)"
+  count_and_display "./check-pages/misplaced-pages.txt" "misplaced page(s)"
+  count_and_display "./check-pages/lint-errors.txt" "linter error(s)"
+
+  printf -- '_%.0s' {1..100}; echo
+
+  folders=$(find ./tldr -type d -name "pages.*" | sort -u)
+  for folder in $folders; do
+    folder_suffix="${folder##*/pages.}"
+
+    trace_begin "report-locale" "$folder_suffix"
+
+    grep_count_and_display "pages.$folder_suffix/" "./inconsistent-filenames.txt" "./check-pages.$folder_suffix/inconsistent-$folder_suffix-filenames.txt" "inconsistent filename(s)"
+    grep_count_and_display "pages.$folder_suffix/" "./set-more-info-link.txt" "./check-pages.$folder_suffix/malformed-or-outdated-more-info-link-$folder_suffix-pages.txt" "malformed or outdated more info link page(s)"
+    grep_count_and_display "pages.$folder_suffix/" "./set-see-also.txt" "./check-pages.$folder_suffix/malformed-or-outdated-see-also-mentions-$folder_suffix-pages.txt" "malformed or outdated see also mention(s)"
+    grep_count_and_display "pages.$folder_suffix/" "./set-alias-page.txt" "./check-pages.$folder_suffix/missing-$folder_suffix-alias-pages.txt" "missing alias page(s)"
+    grep_count_and_display "pages.$folder_suffix/" "./set-page-title.txt" "./check-pages.$folder_suffix/mismatched-$folder_suffix-page-titles.txt" "mismatched page title(s)"
+
+    count_and_display "./check-pages.$folder_suffix/missing-tldr-$folder_suffix-pages.txt" "missing TLDR page(s)"
+    count_and_display "./check-pages.$folder_suffix/orphaned-$folder_suffix-pages.txt" "orphaned page(s)"
+    count_and_display "./check-pages.$folder_suffix/misplaced-$folder_suffix-pages.txt" "misplaced page(s)"
+    count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-command-count.txt" "outdated page(s) based on number of commands"
+    count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-command-contents.txt" "outdated page(s) based on the commands itself"
+    count_and_display "./check-pages.$folder_suffix/outdated-$folder_suffix-pages-based-on-header-line-count.txt" "outdated page(s) based on number of header lines"
+    count_and_display "./check-pages.$folder_suffix/missing-english-$folder_suffix-pages.txt" "missing English page(s)"
+    count_and_display "./check-pages.$folder_suffix/missing-translated-$folder_suffix-pages.txt" "missing translated page(s)"
+    count_and_display "./check-pages.$folder_suffix/lint-errors-$folder_suffix.txt" "linter error(s)"
+
+    trace_end
+
+    printf -- '_%.0s' {1..100}; echo
+  done
+
+  rm -f "./set-more-info-link.txt" "./set-see-also.txt" "./set-alias-page.txt" "./set-page-title.txt"
+
+  trace_begin "merge-totals"
+
+  calculate_and_display '*/check-pages*/inconsistent*filenames.txt' "./inconsistent-filenames.txt" "$total_pages" "inconsistent filename(s)"
+  calculate_and_display '*/check-pages*/malformed-or-outdated-more-info-link*pages.txt' "./malformed-or-outdated-more-info-link-pages.txt" "$total_pages" "malformed or outdated more info link page(s)"
+  calculate_and_display '*/check-pages*/malformed-or-outdated-see-also-mentions*pages.txt' "./malformed-or-outdated-see-also-mentions.txt" "$total_pages_need_see_also_mention" "malformed or outdated see also mention(s)"
+  calculate_and_display '*/check-pages*/missing*alias-pages.txt' "./missing-alias-pages.txt" "" "missing alias page(s)"
+  calculate_and_display '*/check-pages*/mismatched*page-titles.txt' "./mismatched-page-titles.txt" "$total_unique_non_english_pages" "mismatched page title(s)"
+  calculate_and_display '*/check-pages*/missing-tldr*pages.txt' "./missing-tldr-pages.txt" "$total_tldr_pages" "missing TLDR page(s)"
+  calculate_and_display '*/check-pages*/misplaced*pages.txt' "./misplaced-pages.txt" "$total_pages" "misplaced page(s)"
+  calculate_and_display '*/check-pages*/outdated*pages-based-on-command-count.txt' "./outdated-pages-based-on-command-count.txt" "$total_non_english_pages" "outdated page(s) based on number of commands"
+  calculate_and_display '*/check-pages*/outdated*pages-based-on-command-contents.txt' "./outdated-pages-based-on-command-contents.txt" "$total_non_english_pages" "outdated page(s) based on the commands itself"
+  calculate_and_display '*/check-pages*/outdated*pages-based-on-header-line-count.txt' "./outdated-pages-based-on-header-line-count.txt" "$total_non_english_pages" "outdated page(s) based on number of header lines"
+  calculate_and_display '*/check-pages*/missing-english*pages.txt' "./missing-english-pages.txt" "$total_unique_non_english_pages" "missing English page(s)"
+  calculate_and_display '*/check-pages*/missing-translated*pages.txt' "./missing-translated-pages.txt" "$total_pages_need_translation" "missing translated page(s)"
+  calculate_and_display '*/check-pages*/lint-errors*.txt' "./lint-errors.txt" "" "lint error(s)"
+
+  trace_end
+
+  find . -type f \( -path '*/check-pages*/*.txt' -o -path '*.txt' \) -size 0 -exec rm -f {} \;
+}
+
+if [ -n "$SHARD" ]; then
+  shard_locales=$(python3 ./scripts/shard-locales.py "${SHARD#*/}" "${SHARD%/*}") || exit 1
+  if [ -z "$shard_locales" ]; then
+    echo "Shard $SHARD has no locales to check."
+    exit 0
+  fi
+
+  mapfile -t locales <<< "$shard_locales"
+  echo "Checking shard $SHARD: ${locales[*]}"
+  # Keep the output of the checks of every locale for the metrics log, it is written by --merge.
+  for locale in "${locales[@]}"; do
+    run_checks "$locale" 2>&1 | tee "metrics-log-$locale.md"
+  done
+  exit 0
+fi
+
+mapfile -t locales < <(get_locales)
+
+if [ "$MERGE" = false ]; then
+  run_checks "${locales[@]}"
+else
+  # The output of the checks of the shards, in the order of an unsharded run.
+  for locale in "${locales[@]}"; do
+    if [ -f "metrics-log-$locale.md" ]; then
+      cat "metrics-log-$locale.md"
+      rm -f "metrics-log-$locale.md"
+    fi
+  done
+fi
+
+write_report
 
 exit $EXIT_CODE
@@ -4,16 +4,16 @@
 from pathlib import Path
 import re
 import json
-import subprocess
 
-from _common import Colors, create_colored_line
+from _common import Colors, create_colored_line, run_gh_api
+from _trace import stage
 
 ORG_NAME = "tldr-pages"
 REPO_NAME = "tldr"
 
 
 def run_gh_command(command):
-    result = subprocess.run(command, capture_output=True, text=True)
+    result = run_gh_api(command)
     if result.returncode != 0:
         print(
             create_colored_line(
@@ -178,9 +178,11 @@ def parse_maintainers_file(file_path):
 def main():
     maintainers_file_path = Path("tldr/MAINTAINERS.md")
 
-    users_to_check = parse_maintainers_file(maintainers_file_path)
+    with stage("parse-maintainers"):
+        users_to_check = parse_maintainers_file(maintainers_file_path)
 
-    verify_roles(users_to_check)
+    with stage("verify-roles"):
+        verify_roles(users_to_check)
 
 
 if __name__ == "__main__":
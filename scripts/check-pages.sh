@@ -4,6 +4,8 @@
 # This script can be executed to check several things for the translated pages. This could also be run on the English folder, be aware that some checks are not applicable.
 # - Check if a page references missing TLDR pages.
 #   A command is marked as missing when it is mentioned in a page (`tldr {{command}}`) but the referenced command doesn't have a (translated) page.
+# - Check if a page is orphaned.
+#   A page is marked as orphaned when no other page of the language mentions its command (`tldr {{command}}` or in the "See also" line).
 # - Check if a page is misplaced.
 #   A page is marked as misplaced when the page isn't inside a folder in the list of supported platforms.
 # - Check if a page is outdated.
@@ -16,17 +18,16 @@
 
 # Usage: ./check-pages.sh [-l language_id] [-c check_names] [-v]
 #   - language_id (optional): Specify a language identifier (e.g., 'id', 'fr') to filter results for a specific language.
-#   - check_names (optional): Provide an array splitted by "," to only run specific checks [missing_tldr_page,misplaced_page,outdated_page,missing_english_page,missing_translated_page,lint]
+#   - check_names (optional): Provide an array splitted by "," to only run specific checks [missing_tldr_page,missing_see_also_page,orphaned_page,misplaced_page,outdated_page,missing_english_page,missing_translated_page,lint]
 #   - Adding -v enables verbose logging.
+# Set TLDR_TRACE_FILE to record the timings of every stage, see scripts/_trace.sh.
+
+# shellcheck source=scripts/_trace.sh
+source "$(dirname "${BASH_SOURCE[0]}")/_trace.sh"
 
 ROOT_DIR="${TLDR_ROOT:-./tldr}"
-PLATFORMS=("android" "common" "linux" "openbsd" "freebsd" "netbsd" "osx" "sunos" "windows" "cisco-ios" "dos")
 
-# shellcheck disable=SC2016
-HEADER_REGEX='^>.*$'
-# shellcheck disable=SC2016
-COMMAND_REGEX='^`[^`]\+`$'
-CHECK_NAMES="missing_tldr_page,missing_see_also_page,misplaced_page,outdated_page,missing_english_page,missing_translated_page,lint"
+CHECK_NAMES="missing_tldr_page,missing_see_also_page,orphaned_page,misplaced_page,outdated_page,missing_english_page,missing_translated_page,lint"
 VERBOSE=false
 
 while getopts ":l:c:v" opt; do
@@ -52,6 +53,10 @@ if [ -z "$LANGUAGE_ID" ]; then
   LANGUAGE_ID="${BASH_REMATCH[1]}"
 fi
 
+# Set the rules of the language (e.g. LINT_IGNORED_CHECKS), see scripts/_locale_rules.py.
+locale_rules=$(python3 "$(dirname "${BASH_SOURCE[0]}")/locale-rules.py" --tldr-root "$ROOT_DIR" --shell -l "${LANGUAGE_ID:-en}") || exit 1
+eval "$locale_rules"
+
 OUTPUT_DIR="check-pages${LANGUAGE_ID:+.$LANGUAGE_ID}"
 mkdir -p "$OUTPUT_DIR"
 
@@ -64,6 +69,7 @@ if [ $VERBOSE = true ]; then
 fi
 
 MISSING_TLDR_OUTPUT_FILE="$OUTPUT_DIR/missing-tldr${LANGUAGE_ID:+-$LANGUAGE_ID}-pages.txt"
+ORPHANED_OUTPUT_FILE="$OUTPUT_DIR/orphaned${LANGUAGE_ID:+-$LANGUAGE_ID}-pages.txt"
 MISPLACED_OUTPUT_FILE="$OUTPUT_DIR/misplaced${LANGUAGE_ID:+-$LANGUAGE_ID}-pages.txt"
 OUTDATED_BASED_ON_COMMAND_CONTENTS_FILE="$OUTPUT_DIR/outdated${LANGUAGE_ID:+-$LANGUAGE_ID}-pages-based-on-command-contents.txt"
 OUTDATED_BASED_ON_COMMAND_COUNT_FILE="$OUTPUT_DIR/outdated${LANGUAGE_ID:+-$LANGUAGE_ID}-pages-based-on-command-count.txt"
@@ -72,300 +78,77 @@ MISSING_ENGLISH_OUTPUT_FILE="$OUTPUT_DIR/missing-english${LANGUAGE_ID:+-$LANGUAG
 MISSING_TRANSLATED_OUTPUT_FILE="$OUTPUT_DIR/missing-translated${LANGUAGE_ID:+-$LANGUAGE_ID}-pages.txt"
 LINT_FILE="$OUTPUT_DIR/lint-errors${LANGUAGE_ID:+-$LANGUAGE_ID}.txt"
 
-OUTPUT_FILES=( "$MISSING_TLDR_OUTPUT_FILE" "$MISPLACED_OUTPUT_FILE" "$OUTDATED_BASED_ON_COMMAND_CONTENTS_FILE" "$OUTDATED_BASED_ON_COMMAND_COUNT_FILE" "$OUTDATED_BASED_ON_HEADER_FILE" "$MISSING_ENGLISH_OUTPUT_FILE" "$MISSING_TRANSLATED_OUTPUT_FILE" "$LINT_FILE" )
+OUTPUT_FILES=( "$MISSING_TLDR_OUTPUT_FILE" "$ORPHANED_OUTPUT_FILE" "$MISPLACED_OUTPUT_FILE" "$OUTDATED_BASED_ON_COMMAND_CONTENTS_FILE" "$OUTDATED_BASED_ON_COMMAND_COUNT_FILE" "$OUTDATED_BASED_ON_HEADER_FILE" "$MISSING_ENGLISH_OUTPUT_FILE" "$MISSING_TRANSLATED_OUTPUT_FILE" "$LINT_FILE" )
 
 for OUTPUT_FILE in  "${OUTPUT_FILES[@]}"; do
   rm -rf "$OUTPUT_FILE"
   touch "$OUTPUT_FILE"
 done
 
-# Create an array of files to loop over
 folder_path="$ROOT_DIR/pages${LANGUAGE_ID:+.$LANGUAGE_ID}"
-mapfile -t files < <(find "$folder_path" -type f -name "*.md" | sort -u)
 
 if [ ! -e "$folder_path" ]; then
   echo "The specified path does not exist: $folder_path"
   exit 1
 fi
 
-get_english_file() {
-  local file="$1"
-
-  echo "./tldr/pages${file#./tldr/pages."$LANGUAGE_ID"}"
-}
-
-get_translated_file() {
-  local file="$1"
-
-  echo "./tldr/pages.$LANGUAGE_ID${file#./tldr/pages}"
-}
-
-get_platform() {
-  local file="$1"
-
-  echo "$file" | awk -F/ '{print $(NF-1)}'
-}
-
-get_filepath_without_tldr() {
-  local file="$1"
-
-  echo "${file#./tldr/}"
-}
-
-count_commands() {
-  local file="$1"
-
-  grep -c "$COMMAND_REGEX" "$file"
-}
-
-count_header() {
-  local file="$1"
-
-  grep -c "$HEADER_REGEX" "$file"
-}
-
-strip_commands() {
-  local file="$1"
-
-  local stripped_commands=()
-
-  mapfile -t stripped_commands < <(
-    grep "$COMMAND_REGEX" "$file" |
-    sed 's/{{\[\([^|]*|[^]]*\)\]}}/___\1___/g' |
-    sed -E 's/\{\{([^}]|(\{[^}]*\}))*\}\}/{{}}/g' |
-    sed 's/<[^>]*>//g' |
-    sed 's/([^)]*)//g' |
-    sed 's/"[^"]*"/""/g' |
-    sed "s/'[^']*'//g" |
-    sed 's/`//g' |
-    sed 's/___\(.*\)___/{{\[\1\]}}/g'
-  )
-
-  printf "%s\n" "${stripped_commands[*]}"
-}
-
-check_missing_tldr_page() {
-  local file="$1"
-
-  while IFS= read -r line; do
-    line="${line#\`tldr }" # Remove "`tldr " prefix
-    line="${line%\`}"    # Remove the last backtick
-
-    command=$(echo "$line" | sed -E 's/(.*) -[^ ] [^ ]+/\1/')    # Strip off "-p linux" from "wget -p common".
-    command=$(echo "$command" | sed -E 's/-[^ ] [^ ]+ (.*)/\1/') # Strip off "-p linux" from "-p linux awk".
-    command="${command// /-}"
-
-    if ! [[ $command =~ ^-[^[:space:]] ]] && ! [[ $command =~ \{\{.*\}\} ]]; then # Exclude -p / -u / -o (tldr -u) commands and {{commands}}.
-      local missing=true
-      local filename="${command,,}"
-      for platform in "${PLATFORMS[@]}"; do
-        if [ -f "$folder_path/$platform/$filename.md" ]; then
-          missing=false
-          break
-        fi
-      done
-
-      if [ "$missing" = true ]; then
-        local filepath
-        filepath=$(get_filepath_without_tldr "$file")
-
-        echo "$command does not exist yet! Command referenced in $filepath" >> "$MISSING_TLDR_OUTPUT_FILE"
-      fi
-    fi
-  done
-}
-
-check_missing_see_also_page() {
-  local file="$1"
-  read -r line
-  if [ "$line" = "" ]
-  then
-    return
-  fi
-
-  # shellcheck disable=SC2016
-  for command in $(echo "${line}" | grep -o '`[^`]*`' | sed 's/`//g' | sed 's/ /-/g'); do
-      local missing=true
-      local filename="${command,,}"
-      for platform in "${PLATFORMS[@]}"; do
-        if [ -f "$folder_path/$platform/$filename.md" ]; then
-          missing=false
-          break
-        fi
-      done
-
-        if [ "$missing" = true ]; then
-          local filepath
-          filepath=$(get_filepath_without_tldr "$file")
-
-          echo "$command does not exist yet! Command referenced in $filepath" >> "$MISSING_TLDR_OUTPUT_FILE"
-        fi
-  done
-}
-
-check_misplaced_page() {
-  local file="$1"
-  local platform
-  platform=$(get_platform "$file")
-
-  if [[ ! " ${PLATFORMS[*]} " =~ $platform ]]; then
-    local filepath
-    filepath=$(get_filepath_without_tldr "$file")
-
-    echo "$filepath" >> "$MISPLACED_OUTPUT_FILE"
-  fi
-}
-
-check_outdated_page() {
-  local file="$1"
-  local english_file="$2"
-
-  if [ ! -f "$english_file" ]; then
-    return 1
-  fi
-
-  local english_commands
-  local commands
-  english_commands=$(count_commands "$english_file")
-  commands=$(count_commands "$file")
-
-  english_commands_as_string=$(strip_commands "$english_file")
-  commands_as_string=$(strip_commands "$file")
-
-  local filepath
-  filepath=$(get_filepath_without_tldr "$file")
-
-  if [ "$english_commands" != "$commands" ]; then
-    echo "$filepath" >> "$OUTDATED_BASED_ON_COMMAND_COUNT_FILE"
-  elif [ "$english_commands_as_string" != "$commands_as_string" ]; then
-    echo "$filepath" >> "$OUTDATED_BASED_ON_COMMAND_CONTENTS_FILE"
-  fi
-
-  english_header_lines=$(count_header "$english_file")
-  header_lines=$(count_header "$file")
-  if [ "$english_header_lines" != "$header_lines" ]; then
-    echo "$filepath" >> "$OUTDATED_BASED_ON_HEADER_FILE"
-  fi
-}
-
-check_missing_english_page() {
-  local file="$1"
-  local english_file="$2"
-
-  if [ ! -f "$english_file" ]; then
-    local filepath
-    filepath=$(get_filepath_without_tldr "$file")
-
-    echo "$filepath" >> "$MISSING_ENGLISH_OUTPUT_FILE"
-  fi
-}
-
-check_missing_translated_page() {
-  local file="$1"
-  local translated_file="$2"
-
-  if [ ! -f "$translated_file" ]; then
-    local filepath
-    filepath=$(get_filepath_without_tldr "$translated_file")
-
-    echo "$filepath" >> "$MISSING_TRANSLATED_OUTPUT_FILE"
-  fi
-}
-
 lint() {
   local file="$1"
 
   markdownlint "$file" -c "./tldr/.markdownlint.json" >> "$LINT_FILE" 2>&1
 
-  local ignore_checks=("TLDR104")
-
-  case "$LANGUAGE_ID" in
-    "") # LANGUAGE_ID is en
-      ignore_checks=()
-      ;;
-    "ar" | "bn" | "fa" | "hi" | "ja" | "ko" | "lo" | "ml" | "ne" | "ta" | "th" | "tr")
-      ignore_checks+=("TLDR003" "TLDR004" "TLDR015")
-      ;;
-    "zh_TW" | "zh")
-      ignore_checks+=("TLDR003" "TLDR004" "TLDR005" "TLDR015")
-      ;;
-  esac
-
-  mapfile -t ignore_checks < <(IFS=,; echo "${ignore_checks[*]}")
-
-  if [ -n "$LANGUAGE_ID" ]; then
-    tldr-lint --ignore "${ignore_checks[0]}" "$file" >> "$LINT_FILE" 2>&1
+  if [ ${#LINT_IGNORED_CHECKS[@]} -gt 0 ]; then
+    tldr-lint --ignore "$(IFS=,; echo "${LINT_IGNORED_CHECKS[*]}")" "$file" >> "$LINT_FILE" 2>&1
   else
     tldr-lint "$file" >> "$LINT_FILE" 2>&1
   fi
 }
 
 if [[ " ${CHECK_NAMES[*]} " =~ " lint " ]]; then
+  trace_begin "lint" "${LANGUAGE_ID:-en}"
   lint "$folder_path"
+  trace_end
 fi
 
-declare -A section
-state=1
-while IFS= read -r line; do
-  case $state in
-  1)
-    locale=$(echo "$line" | grep "###" | cut -d " " -f 2)
-    if [ -n "$locale" ] ; then
-      state=2
-    fi
-  ;;
-  2)
-    content=$(echo "$line" | grep ">" | cut -d '`' -f 1)
-    if [ -n "$content" ]; then
-      section[$locale]=$content
-      state=1
-    fi
-    if [ "$line" == "---" ]; then
-      state=1
-    fi
-  ;;
+# The other checks of the pages are run at once, see scripts/_page_checks.py.
+page_checks=()
+for check_name in "${CHECK_NAMES[@]}"; do
+  case "$check_name" in
+    misplaced_page|outdated_page|missing_english_page|missing_translated_page)
+      page_checks+=("$check_name")
+      ;;
   esac
-done < ./tldr/contributing-guides/translation-templates/see-also-mentions.md
+done
 
-for file in "${files[@]}"; do
-  if [ -n "$LANGUAGE_ID" ]; then
-    english_file=$(get_english_file "$file")
-  fi
+if [ ${#page_checks[@]} -gt 0 ]; then
+  trace_begin "page-checks" "${LANGUAGE_ID:-en}"
+  python3 "$(dirname "${BASH_SOURCE[0]}")/page-checks.py" --tldr-root "$ROOT_DIR" -l "${LANGUAGE_ID:-en}" -c "$(IFS=,; echo "${page_checks[*]}")"
+  trace_end
+fi
 
-  for check_name in "${CHECK_NAMES[@]}"; do
-    case "$check_name" in
-        "missing_tldr_page")
-            # shellcheck disable=SC2016
-            grep -o '`tldr .*`$' "$file" | check_missing_tldr_page "$file"
-            ;;
-        "missing_see_also_page")
-            grep -o "^${section[${LANGUAGE_ID:-en}]}.*" "$file" | check_missing_see_also_page "$file"
-            ;;
-        "misplaced_page")
-            check_misplaced_page "$file"
-            ;;
-        "outdated_page")
-            if [ -n "$english_file" ]; then
-              check_outdated_page "$file" "$english_file"
-            fi
-            ;;
-        "missing_english_page")
-            if [ -n "$english_file" ]; then
-              check_missing_english_page "$file" "$english_file"
-            fi
-            ;;
-    esac
-  done
-done
+# The mentions of all pages are checked at once, see scripts/_reference_graph.py.
+mention_kinds=()
+if [[ " ${CHECK_NAMES[*]} " =~ " missing_tldr_page " ]]; then
+  mention_kinds+=("tldr")
+fi
+if [[ " ${CHECK_NAMES[*]} " =~ " missing_see_also_page " ]]; then
+  mention_kinds+=("see-also")
+fi
+reference_options=()
+if [ ${#mention_kinds[@]} -gt 0 ]; then
+  reference_options+=(--kinds "$(IFS=,; echo "${mention_kinds[*]}")" --missing "$MISSING_TLDR_OUTPUT_FILE")
+fi
+if [[ " ${CHECK_NAMES[*]} " =~ " orphaned_page " ]]; then
+  reference_options+=(--orphans "$ORPHANED_OUTPUT_FILE")
+fi
 
-if [ -n "$LANGUAGE_ID" ] && [[ " ${CHECK_NAMES[*]} " =~ " missing_translated_page " ]]; then
-  mapfile -t english_files < <(find "$ROOT_DIR/pages" -type f -name "*.md" | sort -u)
-  for english_file in "${english_files[@]}"; do
-    translated_file=$(get_translated_file "$english_file")
-    check_missing_translated_page "$english_file" "$translated_file"
-  done
+if [ ${#reference_options[@]} -gt 0 ]; then
+  trace_begin "reference-graph" "${LANGUAGE_ID:-en}"
+  python3 "$(dirname "${BASH_SOURCE[0]}")/reference-graph.py" --tldr-root "$ROOT_DIR" -l "${LANGUAGE_ID:-en}" check "${reference_options[@]}"
+  trace_end
 fi
 
+# Sort by bytes whatever the locale, like the Python checks do.
 for OUTPUT_FILE in  "${OUTPUT_FILES[@]}"; do
-  sort -o "$OUTPUT_FILE" "$OUTPUT_FILE"
+  LC_ALL=C sort -o "$OUTPUT_FILE" "$OUTPUT_FILE"
 done
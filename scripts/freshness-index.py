@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Keep an index of when every page was last changed, to tell how long ago the English page of a translation changed.
+
+Usage:
+    ./scripts/freshness-index.py [--tldr-root <tldr>] [--index <index>] update
+    ./scripts/freshness-index.py [--tldr-root <tldr>] [--index <index>] stale (-l <locale> | <pages>...)
+
+`update` reads the history of the tldr repository once (`git log --name-only`) and records the last commit changing
+every page. An existing index is extended from its last indexed commit, so only the new commits are read. The history
+must not be shallow, a `--filter=blob:none` clone is enough.
+
+`stale` prints the given translations whose English page changed after them, the stalest first, or those of every
+translation of the locale without pages.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+from pathlib import Path
+from _common import Colors, create_colored_line
+from _freshness import (
+    is_shallow,
+    update_index,
+    load_index,
+    save_index,
+    get_staleness,
+    get_staleness_sort_key,
+    format_staleness,
+)
+
+
+def update(args):
+    if is_shallow(args.tldr_root):
+        print(
+            create_colored_line(
+                Colors.RED,
+                f"{args.tldr_root} is a shallow clone, fetch its history first (git fetch --unshallow --filter=blob:none).",
+            ),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    index = update_index(args.tldr_root, load_index(args.index))
+    save_index(args.index, index)
+    print(f"Indexed {len(index['paths'])} pages up to {index['head']}.")
+
+
+def get_translations(tldr_root: Path, locale: str) -> list[str]:
+    dirname = f"pages.{locale}"
+    return [
+        os.path.relpath(os.path.join(root, file), tldr_root)
+        for root, _, files in os.walk(tldr_root / dirname)
+        for file in files
+        if file.endswith(".md")
+    ]
+
+
+def stale(args):
+    index = load_index(args.index)
+    if index is None:
+        print(
+            create_colored_line(
+                Colors.RED, f"{args.index} not found, run the update command first."
+            ),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    pages = args.pages or get_translations(args.tldr_root, args.locale)
+    stale_pages = [
+        (staleness, page)
+        for page in pages
+        if (staleness := get_staleness(index, page.strip()))
+    ]
+    for staleness, page in sorted(
+        stale_pages, key=lambda item: (get_staleness_sort_key(item[0]), item[1])
+    ):
+        print(f"{page.strip()}: {format_staleness(staleness)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep an index of when every page was last changed."
+    )
+    parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=Path(".freshness-index.json"),
+        help="the index file (default: %(default)s)",
+    )
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    subparsers.add_parser("update", help="index the new commits")
+    stale_parser = subparsers.add_parser(
+        "stale", help="print the translations older than their English page"
+    )
+    stale_parser.add_argument(
+        "-l",
+        dest="locale",
+        help="the locale to check when no pages are given, e.g. fr",
+    )
+    stale_parser.add_argument(
+        "pages", nargs="*", help="the translated pages, e.g. pages.fr/common/tar.md"
+    )
+
+    args = parser.parse_args()
+    if args.command_name == "stale" and not args.pages and not args.locale:
+        parser.error("give the pages to check or a locale")
+
+    match args.command_name:
+        case "update":
+            try:
+                update(args)
+            except subprocess.CalledProcessError as error:
+                print(
+                    create_colored_line(Colors.RED, f"git failed: {error}"),
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+        case "stale":
+            stale(args)
+
+
+if __name__ == "__main__":
+    main()
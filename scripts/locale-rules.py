@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Print the rules of a locale: the supported platforms, the "See also" prefix and the tldr-lint checks to ignore.
+
+Usage:
+    ./scripts/locale-rules.py [--tldr-root <tldr>] [-l <locale>] [--shell]
+
+See scripts/_locale_rules.py. Without --shell all rules are printed as JSON, with --shell the tldr-lint checks to
+ignore of the locale are printed as a Bash array for check-pages.sh:
+
+    eval "$(python3 ./scripts/locale-rules.py --shell -l fr)"
+"""
+
+import os
+import sys
+import json
+import shlex
+import argparse
+
+from pathlib import Path
+from _locale_rules import PLATFORMS, load_locale_rules
+
+
+def format_shell_array(name: str, values: list[str]) -> str:
+    return f"{name}=({' '.join(shlex.quote(value) for value in values)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the rules of a locale.")
+    parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+    parser.add_argument("-l", dest="locale", help="only print the rules of this locale")
+    parser.add_argument(
+        "--shell",
+        action="store_true",
+        help="print the rules of the locale as Bash variables",
+    )
+    args = parser.parse_args()
+
+    rules = load_locale_rules(args.tldr_root)
+
+    if args.shell:
+        rule = rules.get(args.locale or "en")
+        print(format_shell_array("LINT_IGNORED_CHECKS", rule["lint_ignored_checks"]))
+    elif args.locale:
+        json.dump(rules.get(args.locale), sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        json.dump(
+            {"platforms": PLATFORMS, "locales": rules.rules},
+            sys.stdout,
+            indent=2,
+            ensure_ascii=False,
+        )
+        print()
+
+
+if __name__ == "__main__":
+    main()
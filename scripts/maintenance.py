@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Run the maintenance scripts from one entry point, several of them in one process.
+
+Usage:
+    ./scripts/maintenance.py metrics [<calculate-metrics.sh options>...]
+    ./scripts/maintenance.py check-pages [-l <locales>] [--tldr-root <tldr>]
+    ./scripts/maintenance.py dashboard
+    ./scripts/maintenance.py language-issues
+    ./scripts/maintenance.py maintainers
+    ./scripts/maintenance.py lychee <sort-lychee-output.py arguments>...
+    ./scripts/maintenance.py pipeline [--steps <steps>]
+    ./scripts/maintenance.py startup [--runs <runs>]
+
+Every subcommand only imports what it needs when it runs, so `--help` and the small commands start without loading
+the other scripts. `metrics` runs calculate-metrics.sh, the other subcommands run the Python scripts in this process.
+
+`check-pages` runs the checks of check-pages.sh in Python for the given locales (comma separated, by default all), in
+one process: the English pages are read once for all locales instead of once per check-pages.sh run. The linters
+aren't run, their output files are left untouched.
+
+`pipeline` runs the steps after the metrics (dashboard, language-issues and maintainers, by default the first two like
+the workflow does) one after the other in this process, so the modules are imported once and the GitHub API responses
+are shared between the steps: the issues are listed once, and the issues a step creates or updates are updated in that
+list for the next steps.
+
+`startup` measures how long every subcommand takes to start, by running `--help` in fresh interpreters, next to the
+time to import the script directly.
+"""
+
+import os
+import sys
+import argparse
+
+from pathlib import Path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The Python script behind every subcommand that runs one.
+SCRIPTS = {
+    "dashboard": "update-dashboard-issue",
+    "language-issues": "update-language-issues",
+    "maintainers": "check-maintainers",
+    "lychee": "sort-lychee-output",
+}
+
+PIPELINE_STEPS = ["dashboard", "language-issues", "maintainers"]
+
+DEFAULT_PIPELINE_STEPS = ["dashboard", "language-issues"]
+
+
+def load_script(name: str):
+    """
+    Import a maintenance script by its file name, e.g. "update-dashboard-issue".
+    """
+
+    import importlib.util
+
+    module_name = name.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(
+        module_name, os.path.join(SCRIPTS_DIR, f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_script(command: str, arguments: list[str] = ()):
+    module = load_script(SCRIPTS[command])
+    argv = sys.argv
+    sys.argv = [f"{SCRIPTS[command]}.py", *arguments]
+    try:
+        module.main()
+    finally:
+        sys.argv = argv
+
+
+def metrics(args):
+    import subprocess
+
+    script = os.path.join(SCRIPTS_DIR, "calculate-metrics.sh")
+    sys.exit(subprocess.run([script, *args.arguments]).returncode)
+
+
+def check_pages(args):
+    from _trace import stage
+    from _locale_rules import load_locale_rules
+    from _page_checks import (
+        CHECK_FILES,
+        LocalePages,
+        PageChecks,
+        get_check_file,
+        write_check_file,
+    )
+
+    tldr_root = args.tldr_root
+    if args.locales:
+        locales = args.locales.split(",")
+    else:
+        locales = ["en"] + sorted(
+            path.name.split(".", 1)[1] for path in tldr_root.glob("pages.*")
+        )
+
+    rules = load_locale_rules(tldr_root)
+    with stage("load-pages", "en"):
+        english = LocalePages(tldr_root, "en", rules.get_see_also_prefix("en"))
+        english.load()
+
+    for locale in locales:
+        with stage("check-pages", locale):
+            pages = english
+            if locale != "en":
+                pages = LocalePages(
+                    tldr_root, locale, rules.get_see_also_prefix(locale)
+                )
+                pages.load()
+
+            checks = PageChecks(pages, english)
+            checks.check_all()
+            for check in CHECK_FILES:
+                write_check_file(get_check_file(check, locale), checks.get_lines(check))
+
+        print(f"Checked {locale}", file=sys.stderr)
+
+
+def pipeline(args):
+    from _common import Colors, create_colored_line
+
+    steps = args.steps.split(",")
+    for step in steps:
+        if step not in PIPELINE_STEPS:
+            print(
+                create_colored_line(Colors.RED, f"Unknown pipeline step: {step}"),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    for step in steps:
+        print(create_colored_line(Colors.BLUE, f"Running {step}"), file=sys.stderr)
+        try:
+            run_script(step)
+        except SystemExit as e:
+            if e.code:
+                raise
+
+
+def startup(args):
+    import time
+    import statistics
+    import subprocess
+
+    def measure(command: list[str]) -> float:
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            times.append(time.perf_counter() - start)
+        return statistics.median(times) * 1000
+
+    this_script = os.path.abspath(__file__)
+    print(f"| Command | Median startup of {args.runs} runs |")
+    print("|---------|------|")
+    print(f"| `python3 -c pass` | {measure([sys.executable, '-c', 'pass']):.1f} ms |")
+    print(
+        f"| `maintenance.py --help` | {measure([sys.executable, this_script, '--help']):.1f} ms |"
+    )
+    for command in ["check-pages", "pipeline", *SCRIPTS]:
+        elapsed = measure([sys.executable, this_script, command, "--help"])
+        print(f"| `maintenance.py {command} --help` | {elapsed:.1f} ms |")
+
+    # Importing a script runs everything but its main(), which is the startup cost of running it on its own.
+    for command, script in SCRIPTS.items():
+        code = f"import sys; sys.path.insert(0, {SCRIPTS_DIR!r}); import maintenance; maintenance.load_script({script!r})"
+        elapsed = measure([sys.executable, "-c", code])
+        print(f"| import `{script}.py` | {elapsed:.1f} ms |")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the maintenance scripts from one entry point."
+    )
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    metrics_parser = subparsers.add_parser(
+        "metrics", help="run calculate-metrics.sh", add_help=False
+    )
+    metrics_parser.add_argument("arguments", nargs=argparse.REMAINDER)
+    metrics_parser.set_defaults(function=metrics)
+
+    check_pages_parser = subparsers.add_parser(
+        "check-pages", help="run the checks of check-pages.sh for several locales"
+    )
+    check_pages_parser.add_argument(
+        "-l",
+        dest="locales",
+        help="the locales to check, comma separated (default: all)",
+    )
+    check_pages_parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+    check_pages_parser.set_defaults(function=check_pages)
+
+    for command, help_text in [
+        ("dashboard", "update the translation dashboard issue"),
+        ("language-issues", "update the translation dashboard issue of every language"),
+        ("maintainers", "check the roles of the maintainers"),
+    ]:
+        subparsers.add_parser(command, help=help_text).set_defaults(
+            function=lambda args, command=command: run_script(command)
+        )
+
+    lychee_parser = subparsers.add_parser(
+        "lychee", help="run sort-lychee-output.py", add_help=False
+    )
+    lychee_parser.add_argument("arguments", nargs=argparse.REMAINDER)
+    lychee_parser.set_defaults(
+        function=lambda args: run_script("lychee", args.arguments)
+    )
+
+    pipeline_parser = subparsers.add_parser(
+        "pipeline", help="run several steps in this process"
+    )
+    pipeline_parser.add_argument(
+        "--steps",
+        default=",".join(DEFAULT_PIPELINE_STEPS),
+        help="the steps to run, comma separated (default: %(default)s)",
+    )
+    pipeline_parser.set_defaults(function=pipeline)
+
+    startup_parser = subparsers.add_parser(
+        "startup", help="measure the startup time of every subcommand"
+    )
+    startup_parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="the number of runs per command (default: %(default)s)",
+    )
+    startup_parser.set_defaults(function=startup)
+
+    args = parser.parse_args()
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Build and read the metrics archive, the outputs of a metrics run in one indexed SQLite file.
+
+Usage:
+    ./scripts/metrics-archive.py [--archive <archive>] build [--root <directory>]
+    ./scripts/metrics-archive.py [--archive <archive>] list [-l <locale>] [-t <topic>]
+    ./scripts/metrics-archive.py [--archive <archive>] cat [-l <locale>] [-t <topic>] [<path>]
+    ./scripts/metrics-archive.py [--archive <archive>] export [-l <locale>] [-t <topic>] [--output-dir <directory>]
+
+`build` archives `metrics-log.md` and the `check-pages*/` directories. Every file is compressed on its own and indexed
+by locale and topic (e.g. `fr` and `missing-tldr`), so `cat` and `export` only decompress what they are asked for.
+Exporting everything also writes the merged `*.txt` files of calculate-metrics.sh, so the archive replaces them all.
+"""
+
+import sys
+import locale
+import argparse
+
+from pathlib import Path
+from contextlib import closing
+from _common import Colors, create_colored_line, CHECK_PAGES_TOPIC_FILES
+from _metrics_archive import (
+    build_archive,
+    open_archive,
+    list_files,
+    read_files,
+    export_archive,
+)
+
+
+def build(args):
+    count = build_archive(args.root, args.archive)
+    print(f"Archived {count} files in {args.archive}")
+
+
+def list_archive(args):
+    with closing(open_archive(args.archive)) as connection:
+        for path, file_locale, topic, lines, size in list_files(
+            connection, args.locale, args.topic
+        ):
+            print(
+                f"{lines:>8} {size:>10}  {file_locale or '-':<6} {topic or '-':<40} {path}"
+            )
+
+
+def cat(args):
+    with closing(open_archive(args.archive)) as connection:
+        found = False
+        for _, data in read_files(connection, args.locale, args.topic, args.path):
+            sys.stdout.buffer.write(data)
+            found = True
+
+    if not found:
+        print(
+            create_colored_line(Colors.RED, "No matching file in the archive"),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def export(args):
+    # Sort the merged files like `sort -u` in calculate-metrics.sh, which follows the collation of the environment.
+    sort_key = None
+    try:
+        locale.setlocale(locale.LC_COLLATE, "")
+        sort_key = locale.strxfrm
+    except locale.Error:
+        print(
+            create_colored_line(
+                Colors.RED,
+                "The locale of the environment isn't available, sorting by code point",
+            ),
+            file=sys.stderr,
+        )
+
+    with closing(open_archive(args.archive)) as connection:
+        written = export_archive(
+            connection, args.output_dir, args.locale, args.topic, sort_key
+        )
+    print(f"Exported {len(written)} files to {args.output_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and read the metrics archive.")
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        default=Path("metrics.sqlite"),
+        help="the metrics archive (default: %(default)s)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    filter_options = argparse.ArgumentParser(add_help=False)
+    filter_options.add_argument("-l", dest="locale", help="only this locale, e.g. fr")
+    filter_options.add_argument(
+        "-t", dest="topic", choices=CHECK_PAGES_TOPIC_FILES, help="only this topic"
+    )
+
+    build_parser = subparsers.add_parser("build", help="archive a metrics run")
+    build_parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path("."),
+        help="the directory calculate-metrics.sh ran in (default: %(default)s)",
+    )
+
+    subparsers.add_parser(
+        "list", parents=[filter_options], help="list the archived files"
+    )
+
+    cat_parser = subparsers.add_parser(
+        "cat", parents=[filter_options], help="print archived files"
+    )
+    cat_parser.add_argument(
+        "path", nargs="?", help="an archived file, e.g. metrics-log.md"
+    )
+
+    export_parser = subparsers.add_parser(
+        "export", parents=[filter_options], help="write archived files back"
+    )
+    export_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("."),
+        help="where to write the files (default: %(default)s)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        match args.command:
+            case "build":
+                build(args)
+            case "list":
+                list_archive(args)
+            case "cat":
+                cat(args)
+            case "export":
+                export(args)
+    except FileNotFoundError as e:
+        print(create_colored_line(Colors.RED, str(e)), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
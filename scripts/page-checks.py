@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Run the page checks of check-pages.sh for a language and write their results, see scripts/_page_checks.py.
+
+Usage:
+    ./scripts/page-checks.py [--tldr-root <tldr>] [-l <locale>] [-c <checks>]
+
+The checks are given with the names check-pages.sh uses (comma separated), only their output files are written. The
+checks comparing a page with its English page (`outdated_page`, `missing_english_page` and `missing_translated_page`)
+don't apply to English, their files are left empty.
+"""
+
+import os
+import sys
+import argparse
+
+from pathlib import Path
+from _common import Colors, create_colored_line
+from _locale_rules import load_locale_rules
+from _page_checks import (
+    LocalePages,
+    PageChecks,
+    get_check_file,
+    write_check_file,
+)
+
+# The checks of check-pages.sh run here, with the results they write.
+PAGE_CHECKS = {
+    "misplaced_page": ["misplaced_page"],
+    "outdated_page": [
+        "outdated_page_command_count",
+        "outdated_page_command_contents",
+        "outdated_page_header",
+    ],
+    "missing_english_page": ["missing_english_page"],
+    "missing_translated_page": ["missing_translated_page"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the page checks of check-pages.sh for a language."
+    )
+    parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-l",
+        dest="locale",
+        default="en",
+        help="the locale of the pages (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-c",
+        dest="checks",
+        default=",".join(PAGE_CHECKS),
+        help="the checks to run, comma separated (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    checks = [check for check in args.checks.split(",") if check]
+    for check in checks:
+        if check not in PAGE_CHECKS:
+            print(
+                create_colored_line(Colors.RED, f"Unknown page check: {check}"),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    rules = load_locale_rules(args.tldr_root)
+    english = LocalePages(args.tldr_root, "en", rules.get_see_also_prefix("en"))
+    english.load()
+    pages = english
+    if args.locale != "en":
+        pages = LocalePages(
+            args.tldr_root, args.locale, rules.get_see_also_prefix(args.locale)
+        )
+        pages.load()
+
+    page_checks = PageChecks(pages, english)
+    page_checks.check_all()
+    for check in checks:
+        for result in PAGE_CHECKS[check]:
+            write_check_file(
+                get_check_file(result, args.locale), page_checks.get_lines(result)
+            )
+
+
+if __name__ == "__main__":
+    main()
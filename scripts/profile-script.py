@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Profile one of the Python maintenance scripts locally, against recorded inputs instead of the real repository.
+
+Usage:
+    ./scripts/profile-script.py <script> --inputs <directory> [--profiler cprofile|sample] [--record]
+
+The inputs directory contains what the script would find in CI: `metrics-log.md`, the merged `*.txt` files, the
+`check-pages*/` directories, `tldr/MAINTAINERS.md` and the recorded GitHub API responses in `gh-responses.json`.
+The script runs with its working directory set to the inputs directory and GitHub API calls replayed from the
+recorded responses, so no issue is changed. With --record, GET requests go to the real API (through `gh`) and their
+responses are recorded for later runs, while requests that would change something still aren't sent.
+
+The profiler writes its results to the output directory (by default `profile-<script>/`):
+- cprofile: `<script>.prof` (for snakeviz or flameprof) and `<script>-hot.txt` with the hot functions.
+- sample: `<script>.folded` with collapsed stacks (for flamegraph.pl or speedscope) and `<script>-hot.txt`.
+"""
+
+import os
+import sys
+import time
+import pstats
+import argparse
+import cProfile
+import threading
+import importlib.util
+
+from pathlib import Path
+from collections import Counter
+from _common import GH_REPLAY_ENV, GH_RECORD_ENV, Colors, create_colored_line
+
+SCRIPTS = ["update-dashboard-issue", "update-language-issues", "check-maintainers"]
+
+
+class StackSampler:
+    """
+    Sample the stack of a thread at a fixed interval, counting the collapsed stacks.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            # The outermost frames belong to this profiler, leave them out.
+            stack = stack[::-1][3:]
+            if stack:
+                self.stacks[";".join(stack)] += 1
+
+    def __enter__(self):
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.sampler.join()
+
+    def write_folded(self, path: Path):
+        with path.open("w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def write_hot_functions(self, path: Path, limit: int):
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            functions = stack.split(";")
+            own[functions[-1]] += count
+            for function in set(functions):
+                total[function] += count
+
+        samples = sum(self.stacks.values())
+        with path.open("w", encoding="utf-8") as f:
+            f.write(f"{samples} samples every {self.interval * 1000:g} ms\n\n")
+            f.write(f"{'own':>8} {'total':>8}  function\n")
+            for function, count in own.most_common(limit):
+                f.write(f"{count:>8} {total[function]:>8}  {function}\n")
+
+
+def load_script(name: str):
+    path = Path(__file__).parent / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_main(module):
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code:
+            print(
+                create_colored_line(Colors.RED, f"The script exited with {e.code}"),
+                file=sys.stderr,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Profile a maintenance script against recorded inputs."
+    )
+    parser.add_argument("script", choices=SCRIPTS, help="the script to profile")
+    parser.add_argument(
+        "--inputs", type=Path, required=True, help="the recorded inputs directory"
+    )
+    parser.add_argument(
+        "--gh-responses",
+        type=Path,
+        help="the recorded GitHub API responses (default: <inputs>/gh-responses.json)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="send GET requests to GitHub and record the responses",
+    )
+    parser.add_argument(
+        "--profiler", choices=["cprofile", "sample"], default="cprofile"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.001,
+        help="the sampling interval in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sort",
+        default="cumulative",
+        help="the pstats sort key for the cProfile report (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=30, help="the number of hot functions to report"
+    )
+    parser.add_argument("--output-dir", type=Path, help="where to write the results")
+    args = parser.parse_args()
+
+    inputs = args.inputs.resolve()
+    gh_responses = (args.gh_responses or inputs / "gh-responses.json").resolve()
+    output_dir = (args.output_dir or Path(f"profile-{args.script}")).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if not args.record and not gh_responses.exists():
+        parser.error(f"{gh_responses} not found, record it first with --record")
+
+    # Pass the guard that keeps the scripts from running outside of CI, GitHub API calls are replayed or recorded.
+    os.environ["CI"] = "true"
+    os.environ["GITHUB_REPOSITORY"] = "tldr-pages/tldr-maintenance"
+    os.environ[GH_RECORD_ENV if args.record else GH_REPLAY_ENV] = str(gh_responses)
+
+    module = load_script(args.script)
+    if hasattr(module, "get_tldr_root"):
+        # Read the check-pages directories from the inputs instead of this checkout.
+        module.get_tldr_root = lambda: inputs
+
+    os.chdir(inputs)
+
+    start = time.perf_counter()
+    if args.profiler == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.runcall(run_main, module)
+        elapsed = time.perf_counter() - start
+
+        profiler.dump_stats(output_dir / f"{args.script}.prof")
+        with (output_dir / f"{args.script}-hot.txt").open("w", encoding="utf-8") as f:
+            stats = pstats.Stats(profiler, stream=f)
+            stats.sort_stats(args.sort).print_stats(args.limit)
+    else:
+        with StackSampler(args.interval) as sampler:
+            run_main(module)
+        elapsed = time.perf_counter() - start
+
+        sampler.write_folded(output_dir / f"{args.script}.folded")
+        sampler.write_hot_functions(output_dir / f"{args.script}-hot.txt", args.limit)
+
+    print(
+        create_colored_line(
+            Colors.GREEN,
+            f"Profiled {args.script} in {elapsed:.2f}s, results written to {output_dir}",
+        ),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
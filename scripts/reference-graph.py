@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Check the references between pages: the commands mentioned without a page, and the pages nobody mentions.
+
+Usage:
+    ./scripts/reference-graph.py [-l <locale>] missing [--kinds <kinds>]
+    ./scripts/reference-graph.py [-l <locale>] orphans
+    ./scripts/reference-graph.py [-l <locale>] references <command>
+    ./scripts/reference-graph.py [-l <locale>] check [--kinds <kinds>] [--missing <file>] [--orphans <file>]
+
+`missing` prints the mentions of commands without a page, for the given kinds of mentions (`tldr` and/or `see-also`,
+comma separated). `orphans` prints the pages that no other page of the language mentions. `references` prints the
+pages mentioning a command, e.g. `git-commit`. `check` is used by check-pages.sh, it appends the missing commands and
+the orphaned pages to the given files.
+"""
+
+import os
+import sys
+import argparse
+
+from pathlib import Path
+from _common import Colors, create_colored_line
+from _reference_graph import MENTION_KINDS, build_reference_graph
+
+
+def append_lines(path: Path, lines):
+    with path.open("a", encoding="utf-8") as f:
+        for line in lines:
+            f.write(f"{line}\n")
+
+
+def get_kinds(args) -> list[str]:
+    return [kind for kind in args.kinds.split(",") if kind]
+
+
+def missing(args):
+    graph = build_reference_graph(args.tldr_root, [args.locale])
+    for line in graph.get_missing_pages(args.locale, get_kinds(args)):
+        print(line)
+
+
+def orphans(args):
+    graph = build_reference_graph(args.tldr_root, [args.locale])
+    for page in graph.get_orphaned_pages(args.locale):
+        print(page)
+
+
+def references(args):
+    graph = build_reference_graph(args.tldr_root, [args.locale])
+    pages = graph.get_referencing_pages(args.locale, args.command)
+    if not pages:
+        print(
+            create_colored_line(Colors.RED, f"No page mentions {args.command}"),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    for page in sorted(set(pages)):
+        print(page)
+
+
+def check(args):
+    graph = build_reference_graph(args.tldr_root, [args.locale])
+    kinds = get_kinds(args)
+    if args.missing and kinds:
+        append_lines(args.missing, graph.get_missing_pages(args.locale, kinds))
+    if args.orphans:
+        append_lines(args.orphans, graph.get_orphaned_pages(args.locale))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the references between pages.")
+    parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-l",
+        dest="locale",
+        default="en",
+        help="the locale of the pages (default: %(default)s)",
+    )
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    kinds_options = argparse.ArgumentParser(add_help=False)
+    kinds_options.add_argument(
+        "--kinds",
+        default=",".join(MENTION_KINDS),
+        help="the kinds of mentions to check, comma separated (default: %(default)s)",
+    )
+
+    subparsers.add_parser(
+        "missing", parents=[kinds_options], help="print the missing commands"
+    )
+    subparsers.add_parser("orphans", help="print the orphaned pages")
+    references_parser = subparsers.add_parser(
+        "references", help="print the pages mentioning a command"
+    )
+    references_parser.add_argument("command", help="the command, e.g. git-commit")
+
+    check_parser = subparsers.add_parser(
+        "check", parents=[kinds_options], help="write the results for check-pages.sh"
+    )
+    check_parser.add_argument(
+        "--missing", type=Path, help="append the missing commands to this file"
+    )
+    check_parser.add_argument(
+        "--orphans", type=Path, help="append the orphaned pages to this file"
+    )
+
+    args = parser.parse_args()
+
+    match args.command_name:
+        case "missing":
+            missing(args)
+        case "orphans":
+            orphans(args)
+        case "references":
+            references(args)
+        case "check":
+            check(args)
+
+
+if __name__ == "__main__":
+    main()
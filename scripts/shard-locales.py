@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Split the locales into shards of about the same size, so the metrics can be calculated on several runners.
+
+Usage:
+    ./scripts/shard-locales.py <count> [<index>] [--tldr-root <tldr>] [--manifest <manifest>]
+
+The locales are weighted by the number of pages their checks read and assigned largest first to the lightest shard so
+far, which gives every runner the same shards for the same pages. A translation is weighted with its pages and the
+English pages, which its checks compare it with (e.g. the missing translated pages). English is weighted with its
+pages and all pages, since the shard running English also runs the checks over the whole repository (the set-*.py and
+wrong-filename.py scripts of tldr).
+
+With an index (1 to count) the locales of that shard are printed one per line, otherwise all shards are printed as
+JSON. --manifest writes the JSON to a file as well.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from pathlib import Path
+
+
+def count_pages(directory: Path) -> int:
+    return sum(
+        1
+        for _, _, files in os.walk(directory)
+        for file in files
+        if file.endswith(".md")
+    )
+
+
+def get_locale_weights(tldr_root: Path) -> dict[str, int]:
+    """
+    Get the weight of every locale.
+
+    Parameters:
+    tldr_root (Path): the path of the tldr repository.
+
+    Returns:
+    dict: the number of pages read per locale, e.g. {"en": 60000, "fr": 8300}.
+    """
+
+    english_pages = count_pages(tldr_root / "pages")
+    pages = {
+        directory.name.split(".", 1)[1]: count_pages(directory)
+        for directory in tldr_root.glob("pages.*")
+        if directory.is_dir()
+    }
+    weights = {locale: count + english_pages for locale, count in pages.items()}
+    weights["en"] = english_pages + english_pages + sum(pages.values())
+    return weights
+
+
+def shard_locales(weights: dict[str, int], count: int) -> list[dict]:
+    """
+    Assign the locales to shards, largest locale first to the lightest shard.
+
+    Parameters:
+    weights (dict): the weight of every locale.
+    count (int): the number of shards.
+
+    Returns:
+    list (list of dict): the locales (sorted) and total weight of every shard.
+    """
+
+    shards = [{"locales": [], "weight": 0} for _ in range(count)]
+    for locale in sorted(weights, key=lambda locale: (-weights[locale], locale)):
+        lightest = min(range(count), key=lambda index: (shards[index]["weight"], index))
+        shards[lightest]["locales"].append(locale)
+        shards[lightest]["weight"] += weights[locale]
+
+    for shard in shards:
+        shard["locales"].sort()
+    return shards
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split the locales into shards of about the same size."
+    )
+    parser.add_argument("count", type=int, help="the number of shards")
+    parser.add_argument(
+        "index", type=int, nargs="?", help="only print the locales of this shard"
+    )
+    parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path("tldr"),
+        help="the tldr repository (default: %(default)s)",
+    )
+    parser.add_argument("--manifest", type=Path, help="write the shards to this file")
+    args = parser.parse_args()
+
+    if args.count < 1:
+        parser.error("the number of shards must be at least 1")
+    if args.index is not None and not 1 <= args.index <= args.count:
+        parser.error(f"the shard index must be between 1 and {args.count}")
+
+    shards = shard_locales(get_locale_weights(args.tldr_root), args.count)
+    manifest = {
+        "count": args.count,
+        "shards": [
+            {"index": index, **shard} for index, shard in enumerate(shards, start=1)
+        ],
+    }
+
+    if args.manifest:
+        with args.manifest.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+
+    if args.index is not None:
+        print("\n".join(shards[args.index - 1]["locales"]))
+    else:
+        json.dump(manifest, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
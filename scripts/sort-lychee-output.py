@@ -1,50 +1,442 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: MIT
 
+"""
+Keep track of the link statuses for the link check, and sort the failed URLs in the Markdown report of lychee.
+
+Usage:
+    ./scripts/sort-lychee-output.py collect [--tldr-root <tldr>] [--cache <cache>] [--exclude-file <file>] [--links <links>]
+        [--index <index>]
+    ./scripts/sort-lychee-output.py sort [report] [--json <sidecar>] [--cache <cache>] [--links <links>] [--index <index>]
+
+`collect` gathers the links of all pages in every language, once per link, and writes the ones that are failing or
+whose cached status expired to the links file for lychee, except the ones lychee would exclude (see .lycheeignore).
+The pages using each link are written to the index.
+
+`sort` processes the report (by default `lychee/out.md`) line by line. Failures are sorted in chunks that are spilled
+to temporary files and merged afterwards, so memory stays bounded however large the report is. Every URL is reported
+once, grouped by status class with the pages using it, and the report is replaced atomically so a crash can't
+truncate it. The failures are also written to a JSON sidecar (by default the report with a `.json` suffix). With
+--cache, the status of every checked link is recorded in the cache, streaming the links file and the sorted failures.
+Links are only recorded as ok when the report has a summary and lychee skipped none of them.
+"""
+
+import os
 import re
+import sys
+import json
+import time
+import heapq
+import argparse
+import tempfile
+
 from pathlib import Path
+from itertools import groupby
+from _common import Colors, create_colored_line
+from _link_cache import (
+    get_status_class,
+    collect_links,
+    load_exclude_patterns,
+    is_excluded,
+    lookup,
+    load_cache,
+    save_cache,
+    prune_cache,
+    select_links_to_check,
+    update_cache,
+)
+
+FAILURE_PATTERN = re.compile(r"^\* \[([^\]]+)\] <([^>]+)>.* \| .*$")
+ERRORS_HEADING = "## Errors per input"
+# A row of the summary table, e.g. "| 👻 Excluded | 5 |" (the emoji depends on the lychee version).
+SUMMARY_PATTERN = re.compile(r"^\|[^|\w]*(\w[\w ]*?)\s*\|\s*(\d+)\s*\|")
+# The summary counts of the links lychee didn't check.
+SKIPPED_COUNTS = ["Excluded", "Unsupported", "Unknown"]
+MAX_PAGES_PER_FAILURE = 5
+
+
+def parse_failure(line: str) -> tuple[str, str]:
+    """
+    Parse a failure line of the lychee report.
+
+    Parameters:
+    line (str): a line of the report.
+
+    Returns:
+    tuple (str, str): the URL and the error info, or None when the line isn't a failure or is a redirect (200).
+    """
+
+    match = FAILURE_PATTERN.match(line)
+    if not match or match.group(1).startswith("200"):
+        return None
+    return match.group(2), match.group(1)
+
+
+def read_summary(report: Path) -> dict[str, int]:
+    """
+    Read the summary table of the report, which lychee only writes when it finished.
+
+    Returns:
+    dict: the count per status, e.g. {"Total": 100, "Excluded": 5}, empty without a summary.
+    """
+
+    counts = {}
+    with report.open(encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(ERRORS_HEADING):
+                break
+            if match := SUMMARY_PATTERN.match(line):
+                counts[match.group(1)] = int(match.group(2))
+    return counts
+
+
+def status_class_sort_key(status_class: str) -> tuple[int, str]:
+    # Status codes first (4xx, 5xx, ...), then timeouts, then everything else.
+    if status_class[0].isdigit():
+        return 0, status_class
+    return (1, status_class) if status_class == "Timeout" else (2, status_class)
+
+
+def write_run(failures: list[tuple[str, str]], directory: Path) -> Path:
+    """
+    Sort a chunk of failures by URL and write it to a temporary file, keeping the first failure of every URL.
+    """
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, suffix=".run", delete=False
+    ) as f:
+        for url, group in groupby(sorted(failures, key=lambda x: x[0]), lambda x: x[0]):
+            f.write(f"{url}\t{next(group)[1]}\n")
+        return Path(f.name)
+
+
+def read_run(path: Path):
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            url, error_info = line.rstrip("\n").split("\t", 1)
+            yield url, error_info
+
+
+def merge_runs(runs: list[Path]):
+    """
+    Merge the sorted runs into one stream of failures sorted by URL, with every URL once.
+    """
+
+    # heapq.merge is stable, so the earliest failure of a URL in the report wins.
+    merged = heapq.merge(*(read_run(run) for run in runs), key=lambda x: x[0])
+    for _, group in groupby(merged, lambda x: x[0]):
+        yield next(group)
+
+
+def format_failure(url: str, error_info: str, pages: list[str]) -> str:
+    if not pages:
+        return f"* [{error_info}] [{url}]({url})"
+
+    used_in = ", ".join(pages[:MAX_PAGES_PER_FAILURE])
+    if len(pages) > MAX_PAGES_PER_FAILURE:
+        used_in += f" and {len(pages) - MAX_PAGES_PER_FAILURE} more"
+    return f"* [{error_info}] [{url}]({url}) ({used_in})"
+
+
+def collect_failures(report, summary, spill_directory: Path, chunk_size: int):
+    """
+    Copy the summary of the report and spill its failures in sorted runs.
+
+    Parameters:
+    report (file): the lychee report.
+    summary (file): where to copy everything before the errors heading to.
+    spill_directory (Path): where to write the sorted runs.
+    chunk_size (int): the number of failures to sort in memory at once.
+
+    Returns:
+    tuple (list of Path, bool): the sorted runs, and whether the report has an errors section.
+    """
+
+    runs = []
+    chunk = []
+    found_errors = False
+
+    for line in report:
+        if line.startswith(ERRORS_HEADING):
+            found_errors = True
+        if not found_errors:
+            summary.write(line)
+
+        if (failure := parse_failure(line.rstrip("\n"))) is not None:
+            chunk.append(failure)
+            if len(chunk) >= chunk_size:
+                runs.append(write_run(chunk, spill_directory))
+                chunk = []
 
+    if chunk:
+        runs.append(write_run(chunk, spill_directory))
 
-def extract_failures(markdown_text):
-    failure_pattern = re.compile(r"^\* \[([^\]]+)\] <([^>]+)>.* \| .*$", re.MULTILINE)
-    failures = failure_pattern.findall(markdown_text)
+    return runs, found_errors
 
-    # Drop redirects (200)
-    return [
-        (error_info, url)
-        for error_info, url in failures
-        if not error_info.startswith(("200"))
+
+def split_by_status_class(runs: list[Path], spill_directory: Path) -> dict:
+    """
+    Split the merged failures in one file per status class, each sorted by URL.
+
+    Returns:
+    dict: the file and number of failures per status class, ordered by status class.
+    """
+
+    class_files = {}
+    class_counts = {}
+    try:
+        for url, error_info in merge_runs(runs):
+            status_class = get_status_class(error_info)
+            if status_class not in class_files:
+                class_files[status_class] = (
+                    spill_directory / f"{len(class_files)}.class"
+                ).open("w", encoding="utf-8")
+                class_counts[status_class] = 0
+            class_files[status_class].write(f"{url}\t{error_info}\n")
+            class_counts[status_class] += 1
+    finally:
+        for class_file in class_files.values():
+            class_file.close()
+
+    return {
+        status_class: (Path(class_files[status_class].name), class_counts[status_class])
+        for status_class in sorted(class_files, key=status_class_sort_key)
+    }
+
+
+def write_errors_section(f, status_classes: dict, index: dict):
+    f.write(f"{ERRORS_HEADING}\n\n### Errors in links.txt\n")
+    for status_class, (class_file, count) in status_classes.items():
+        f.write(f"\n#### {status_class} ({count})\n\n")
+        for url, error_info in read_run(class_file):
+            pages = lookup(index, url) or []
+            f.write(format_failure(url, error_info, pages) + "\n")
+
+
+def write_sidecar(f, status_classes: dict, index: dict):
+    """
+    Write the failures as JSON, one status class at a time, without holding them in memory.
+    """
+
+    total = sum(count for _, count in status_classes.values())
+    f.write(f'{{"total": {total}, "classes": {{')
+    for class_index, (status_class, (class_file, count)) in enumerate(
+        status_classes.items()
+    ):
+        f.write(", " if class_index else "")
+        f.write(f'{json.dumps(status_class)}: {{"count": {count}, "failures": [')
+        for failure_index, (url, error_info) in enumerate(read_run(class_file)):
+            f.write(", " if failure_index else "")
+            pages = lookup(index, url) or []
+            f.write(json.dumps({"status": error_info, "url": url, "pages": pages}))
+        f.write("]}")
+    f.write("}}\n")
+
+
+def replace_atomically(path: Path, write):
+    """
+    Write a file next to the given path and rename it over the path, so the path is never left half-written.
+    """
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+def process_report(
+    report: Path, sidecar: Path, chunk_size: int, index: dict, spill_directory: Path
+) -> dict:
+    """
+    Sort the failures of the report, rewrite the report and write the JSON sidecar.
+
+    Returns:
+    dict: the file and number of failures per status class in the spill directory, see split_by_status_class.
+    """
+
+    summary_file = spill_directory / "summary.md"
+
+    with report.open(encoding="utf-8") as f, summary_file.open(
+        "w", encoding="utf-8"
+    ) as summary:
+        runs, found_errors = collect_failures(f, summary, spill_directory, chunk_size)
+
+    status_classes = split_by_status_class(runs, spill_directory)
+
+    def write_report(f):
+        with summary_file.open(encoding="utf-8") as summary:
+            for line in summary:
+                f.write(line)
+        write_errors_section(f, status_classes, index)
+
+    # Without an errors section there is nothing to sort, leave the report untouched.
+    if found_errors:
+        replace_atomically(report, write_report)
+    replace_atomically(sidecar, lambda f: write_sidecar(f, status_classes, index))
+
+    return status_classes
+
+
+def read_failures(status_classes: dict):
+    for class_file, _ in status_classes.values():
+        yield from read_run(class_file)
+
+
+def collect(args):
+    links = collect_links(args.tldr_root)
+    cache = prune_cache(load_cache(args.cache), links)
+    # Leave out the links lychee would skip, so every link it gets is really checked.
+    exclude_patterns = load_exclude_patterns(args.exclude_file)
+    links_to_check = [
+        url
+        for url in select_links_to_check(links, cache, int(time.time()))
+        if not is_excluded(url, exclude_patterns)
     ]
 
+    replace_atomically(
+        args.links, lambda f: f.writelines(f"{url}\n" for url in links_to_check)
+    )
+    replace_atomically(args.index, lambda f: json.dump(links, f))
+    save_cache(args.cache, cache)
+
+    print(
+        f"Checking {len(links_to_check)} of {len(links)} links, {len(links) - len(links_to_check)} have a fresh cached status"
+    )
 
-def sort_failures_alphabetically(failures):
-    return sorted(failures, key=lambda x: x[1])
 
+def sort(args):
+    index = {}
+    if args.index.exists():
+        with args.index.open(encoding="utf-8") as f:
+            index = json.load(f)
 
-def format_failures(sorted_failures):
-    formatted_failures = []
-    for error_info, url in sorted_failures:
-        formatted_failures.append(f"* [{error_info}] [{url}]({url})")
-    return "\n".join(formatted_failures)
+    sidecar = args.json or args.report.with_suffix(".json")
+    summary = read_summary(args.report)
+    with tempfile.TemporaryDirectory() as spill_directory:
+        status_classes = process_report(
+            args.report, sidecar, args.chunk_size, index, Path(spill_directory)
+        )
+
+        if args.cache:
+            update_link_cache(args, summary, status_classes)
+
+
+def update_link_cache(args, summary: dict, status_classes: dict):
+    """
+    Record the statuses of the link check in the cache, streaming the links file and the sorted failures.
+
+    A link is only recorded as ok when lychee finished (the report has a summary) and skipped no links, since the
+    report doesn't list the links that were checked successfully.
+    """
+
+    if "Total" not in summary:
+        print(
+            create_colored_line(
+                Colors.RED,
+                "The lychee report has no summary, the link status cache isn't updated",
+            ),
+            file=sys.stderr,
+        )
+        return
+
+    skipped = sum(summary.get(count, 0) for count in SKIPPED_COUNTS)
+    if skipped:
+        print(
+            create_colored_line(
+                Colors.RED,
+                f"lychee skipped {skipped} link(s), only the failures are recorded in the link status cache",
+            ),
+            file=sys.stderr,
+        )
+
+    cache = load_cache(args.cache)
+    with args.links.open(encoding="utf-8") as f:
+        update_cache(
+            cache,
+            read_failures(status_classes),
+            int(time.time()),
+            () if skipped else (line.strip() for line in f if line.strip()),
+        )
+    save_cache(args.cache, cache)
 
 
 def main():
-    input_file = Path("lychee/out.md")
+    parser = argparse.ArgumentParser(
+        description="Keep track of the link statuses and sort the lychee report."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    cache_options = argparse.ArgumentParser(add_help=False)
+    cache_options.add_argument(
+        "--links",
+        type=Path,
+        default=Path("links.txt"),
+        help="the links to check with lychee (default: %(default)s)",
+    )
+    cache_options.add_argument(
+        "--index",
+        type=Path,
+        default=Path("links-index.json"),
+        help="the pages using each link (default: %(default)s)",
+    )
 
-    with input_file.open(encoding="utf-8") as f:
-        markdown_text = f.read()
+    collect_parser = subparsers.add_parser(
+        "collect", parents=[cache_options], help="collect the links to check"
+    )
+    collect_parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path("tldr"),
+        help="the tldr repository (default: %(default)s)",
+    )
+    collect_parser.add_argument(
+        "--cache",
+        type=Path,
+        default=Path(".link-status-cache.json"),
+        help="the link status cache (default: %(default)s)",
+    )
+    collect_parser.add_argument(
+        "--exclude-file",
+        type=Path,
+        default=Path(".lycheeignore"),
+        help="the patterns of the links lychee excludes (default: %(default)s)",
+    )
 
-    failures = extract_failures(markdown_text)
-    sorted_failures = sort_failures_alphabetically(failures)
-    formatted_sorted_failures = format_failures(sorted_failures)
+    sort_parser = subparsers.add_parser(
+        "sort", parents=[cache_options], help="sort the lychee report"
+    )
+    sort_parser.add_argument(
+        "report",
+        type=Path,
+        nargs="?",
+        default=Path("lychee/out.md"),
+        help="the lychee Markdown report (default: %(default)s)",
+    )
+    sort_parser.add_argument(
+        "--json", type=Path, help="the JSON sidecar (default: the report as .json)"
+    )
+    sort_parser.add_argument(
+        "--cache", type=Path, help="record the checked links in this cache"
+    )
+    sort_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="the number of failures sorted in memory at once (default: %(default)s)",
+    )
 
-    with input_file.open(mode="w") as f:
-        summary_end_index = markdown_text.index("## Errors per input")
-        f.write(markdown_text[:summary_end_index])
+    args = parser.parse_args()
 
-        f.write("## Errors per input\n\n### Errors in links.txt\n\n")
-        f.write(formatted_sorted_failures)
-        f.write("\n")
+    if args.command == "collect":
+        collect(args)
+    else:
+        sort(args)
 
 
 if __name__ == "__main__":
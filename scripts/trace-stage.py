@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Record and report the opt-in stage instrumentation of the metrics run.
+
+Usage:
+    ./scripts/trace-stage.py run --stage <name> [--locale <locale>] -- <command...>
+    ./scripts/trace-stage.py report [--trace <trace.jsonl>] [--chrome-trace <trace.json>] [--summary <summary.md>]
+
+`run` executes a command and appends its wall time, CPU time, peak RSS and system-wide fork count to $TLDR_TRACE_FILE.
+`report` converts the recorded events to a Chrome trace-event JSON file (open it in https://ui.perfetto.dev)
+and appends a summary table per stage and per locale to $GITHUB_STEP_SUMMARY, or prints it when that isn't set.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from pathlib import Path
+from _trace import (
+    get_trace_file,
+    run_command,
+    read_events,
+    to_chrome_trace,
+    render_summary,
+)
+from _common import Colors, create_colored_line
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record and report the stage instrumentation of the metrics run."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run a command as a traced stage")
+    run_parser.add_argument("--stage", required=True, help="the name of the stage")
+    run_parser.add_argument("--locale", help="the locale the stage is working on")
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="the command")
+
+    report_parser = subparsers.add_parser("report", help="report the traced stages")
+    report_parser.add_argument(
+        "--trace", type=Path, default=get_trace_file(), help="the recorded events"
+    )
+    report_parser.add_argument(
+        "--chrome-trace", type=Path, help="write a Chrome trace-event JSON file"
+    )
+    report_parser.add_argument(
+        "--summary",
+        type=Path,
+        default=os.environ.get("GITHUB_STEP_SUMMARY"),
+        help="append the summary tables to this file",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not command:
+            parser.error("run requires a command")
+        sys.exit(run_command(args.stage, args.locale, command))
+
+    if args.trace is None or not args.trace.exists():
+        print(
+            create_colored_line(
+                Colors.RED, "No trace file found, set TLDR_TRACE_FILE."
+            ),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    events = read_events(args.trace)
+
+    if args.chrome_trace:
+        with args.chrome_trace.open("w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(events), f)
+
+    summary = render_summary(events)
+    if args.summary:
+        with args.summary.open("a", encoding="utf-8") as f:
+            f.write(summary)
+    else:
+        print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,10 @@ import re
 import sys
 
 from pathlib import Path
-from enum import Enum
 from _common import (
+    get_tldr_root,
+    get_topic_title,
+    MERGED_TOPIC_FILES,
     get_datetime_pretty,
     strip_dynamic_content,
     get_github_issue,
@@ -16,37 +18,8 @@ from _common import (
     generate_github_edit_link,
     generate_github_new_link,
 )
-
-
-class Topics(str, Enum):
-    def __str__(self):
-        return str(
-            self.value
-        )  # make str(Topics.TOPIC) return the Topic instead of an Enum object
-
-    INCONSISTENT_FILENAMES = "inconsistent filename(s)"
-    MALFORMED_OR_OUTDATED_MORE_INFO_LINK_PAGES = (
-        "malformed or outdated more info link page(s)"
-    )
-    MALFORMED_OR_OUTDATED_SEE_ALSO_MENTIONS = (
-        "malformed or outdated see also mention(s)"
-    )
-    MISSING_ALIAS_PAGES = "missing alias page(s)"
-    MISMATCHED_PAGE_TITLES = "mismatched page title(s)"
-    MISSING_TLDR_PAGES = "missing TLDR page(s)"
-    MISPLACED_PAGES = "misplaced page(s)"
-    OUTDATED_PAGES_BASED_ON_COMMAND_COUNT = (
-        "outdated page(s) based on number of commands"
-    )
-    OUTDATED_PAGES_BASED_ON_COMMAND_CONTENTS = (
-        "outdated page(s) based on the commands itself"
-    )
-    OUTDATED_PAGES_BASED_ON_HEADER_LINE_COUNT = (
-        "outdated page(s) based on number of header lines"
-    )
-    MISSING_ENGLISH_PAGES = "missing English page(s)"
-    MISSING_TRANSLATED_PAGES = "missing translated page(s)"
-    LINT_ERRORS = "linter error(s)"
+from _trace import stage
+from _coverage_matrix import CoverageMatrix, build_coverage_matrix
 
 
 def parse_log_file(path: Path) -> dict:
@@ -128,30 +101,15 @@ def add_language_details(line, patterns, current_language, data):
 
 
 def parse_seperate_text_files(data):
-    for file in [
-        Path("inconsistent-filenames.txt"),
-        Path("malformed-or-outdated-more-info-link-pages.txt"),
-        Path("malformed-or-outdated-see-also-mentions.txt"),
-        Path("missing-alias-pages.txt"),
-        Path("mismatched-page-titles.txt"),
-        Path("missing-tldr-pages.txt"),
-        Path("misplaced-pages.txt"),
-        Path("outdated-pages-based-on-command-count.txt"),
-        Path("outdated-pages-based-on-command-contents.txt"),
-        Path("outdated-pages-based-on-header-line-count.txt"),
-        Path("missing-english-pages.txt"),
-        Path("missing-translated-pages.txt"),
-        Path("lint-errors.txt"),
-    ]:
+    for topic_name, file_name in MERGED_TOPIC_FILES.items():
+        file = Path(file_name)
         if not file.is_file():
             continue
-        topic_name = file.name.replace(".txt", "").replace("-", "_")
-        if hasattr(Topics, topic_name.upper()):
-            topic = getattr(Topics, topic_name.upper()).value
-            if topic:
-                with file.open(encoding="utf-8") as f:
-                    lines = f.readlines()
-                    add_metric_details(lines, data, topic_name, topic, file.name)
+        with file.open(encoding="utf-8") as f:
+            lines = f.readlines()
+            add_metric_details(
+                lines, data, topic_name, get_topic_title(topic_name), file.name
+            )
     return data
 
 
@@ -163,13 +121,13 @@ def add_metric_details(lines, data, topic_name, topic, file_name):
     }
     if len(lines) <= 100:
         match topic_name:
-            case "inconsistent_filenames":
+            case "inconsistent":
                 data["metrics"][topic]["files"] = [f"{line.strip()}" for line in lines]
-            case "missing_alias_pages":
+            case "alias-pages":
                 data["metrics"][topic]["files"] = [
                     f"{generate_github_new_link(line.strip())}" for line in lines
                 ]
-            case "missing_tldr_pages":
+            case "missing-tldr":
                 data["metrics"][topic]["files"] = [
                     f"{generate_github_link(line.strip())}" for line in lines
                 ]
@@ -179,6 +137,53 @@ def add_metric_details(lines, data, topic_name, topic, file_name):
                 ]
 
 
+def get_percentage(part, total):
+    # Rounded down, like calculate-metrics.sh.
+    return part * 100 // total if total else 0
+
+
+def generate_coverage(matrix: CoverageMatrix):
+    markdown = "\n## Translation Coverage\n\n"
+    markdown += "| Language | Translated | Up to date |\n"
+    markdown += "|----------|------------|------------|\n"
+
+    locales = sorted(matrix.present)
+    for locale in locales:
+        total, translated, up_to_date = matrix.get_coverage(locale)
+        markdown += f"| {locale} | {translated}/{total} - {get_percentage(translated, total)}% | {up_to_date}/{total} - {get_percentage(up_to_date, total)}% |\n"
+
+    markdown += "\n<details>\n\n<summary>Translated pages per platform</summary>\n\n"
+    markdown += f"| Language | {' | '.join(matrix.platforms)} |\n"
+    markdown += f"|----------|{'|'.join('---' for _ in matrix.platforms)}|\n"
+    for locale in locales:
+        cells = []
+        for mask in matrix.platforms.values():
+            total, translated, _ = matrix.get_coverage(locale, mask)
+            cells.append(f"{get_percentage(translated, total)}%")
+        markdown += f"| {locale} | {' | '.join(cells)} |\n"
+    markdown += "\n</details>\n"
+
+    untranslated = matrix.get_untranslated().bit_count()
+    markdown += (
+        f"\n- {untranslated} English page(s) aren't translated in any language.\n"
+    )
+
+    counter = matrix.get_outdated_counter()
+    threshold = len(locales) // 2
+    outdated = matrix.get_pages(counter.greater_than(threshold, matrix.all_pages))
+    markdown += f"- {len(outdated)} English page(s) have an outdated translation in more than {threshold} languages.\n"
+    if 0 < len(outdated) <= 100:
+        markdown += (
+            "\n<details>\n\n<summary>Pages outdated in the most languages</summary>\n\n"
+        )
+        counts = {page: counter.get_count(matrix.page_ids[page]) for page in outdated}
+        for page in sorted(outdated, key=lambda page: (-counts[page], page)):
+            markdown += f"- {generate_github_edit_link(f'pages/{page}')} ({counts[page]} languages)\n"
+        markdown += "\n</details>\n"
+
+    return markdown
+
+
 def generate_dashboard(data):
     DETAILS_OPENING = "<details>\n"
     DETAILS_CLOSING = "\n</details>\n"
@@ -213,11 +218,15 @@ def generate_dashboard(data):
 
     markdown += "\n## Detailed Breakdown by Language\n\n"
 
+    # Fetch the issues once instead of once per language. Like a lookup by title, the first (newest) issue with a
+    # title wins.
+    issues = {}
+    for issue in get_github_issue() or []:
+        issues.setdefault(issue["title"], issue)
+
     for lang, details in data["details"].items():
         markdown += DETAILS_OPENING
-        link_to_github_issue = get_github_issue(
-            f"Translation Dashboard Status for {lang}"
-        )
+        link_to_github_issue = issues.get(f"Translation Dashboard Status for {lang}")
         if link_to_github_issue:
             markdown += f'\n<summary><a href="{link_to_github_issue["url"]}">{lang}</a></summary>\n\n'
         else:
@@ -228,6 +237,9 @@ def generate_dashboard(data):
 
         markdown += DETAILS_CLOSING
 
+    if data.get("coverage"):
+        markdown += generate_coverage(data["coverage"])
+
     return markdown
 
 
@@ -250,10 +262,15 @@ def main():
             print(f"{issue_title}-issue not found.", file=sys.stderr)
             sys.exit(0)
 
-        parsed_data = parse_log_file(log_file_path)
-        parsed_data = parse_seperate_text_files(parsed_data)
+        with stage("parse-metrics"):
+            parsed_data = parse_log_file(log_file_path)
+            parsed_data = parse_seperate_text_files(parsed_data)
 
-        markdown_content = generate_dashboard(parsed_data)
+        with stage("build-coverage-matrix"):
+            parsed_data["coverage"] = build_coverage_matrix(get_tldr_root())
+
+        with stage("generate-dashboard"):
+            markdown_content = generate_dashboard(parsed_data)
 
         if strip_dynamic_content(markdown_content) == strip_dynamic_content(
             issue_data["body"]
@@ -263,9 +280,10 @@ def main():
             )
             sys.exit(0)
 
-        result = update_github_issue(
-            issue_data["number"], issue_title, markdown_content
-        )
+        with stage("update-issue"):
+            result = update_github_issue(
+                issue_data["number"], issue_title, markdown_content
+            )
 
         sys.exit(result.returncode)
     else:
@@ -5,11 +5,13 @@ import os
 import sys
 
 from pathlib import Path
-from enum import Enum
 from _common import (
     get_tldr_root,
     get_check_pages_dir,
     get_locale,
+    get_topic_files,
+    get_topic_title,
+    CHECK_PAGES_TOPIC_FILES,
     get_datetime_pretty,
     strip_dynamic_content,
     create_github_issue,
@@ -19,67 +21,104 @@ from _common import (
     generate_github_edit_link,
     generate_github_new_link,
 )
+from _trace import stage
+from _freshness import (
+    load_index,
+    get_staleness,
+    get_staleness_sort_key,
+    format_staleness,
+)
+
+# Topics with this many items are only counted in the issue, not listed.
+MAX_LISTED_ITEMS = 1000
+
+# Topics whose pages are sorted by how long ago their English page changed, when the freshness index is available.
+OUTDATED_TOPICS = [
+    "based-on-command-count",
+    "based-on-command-contents",
+    "based-on-header-line-count",
+]
+
+FRESHNESS_INDEX_FILE = ".freshness-index.json"
+
+
+def read_items(filepath):
+    """
+    Count the lines of a file, reading it once, and keep them if there are fewer than MAX_LISTED_ITEMS. Larger files
+    are only counted, without decoding them or holding them in memory.
 
+    Parameters:
+    filepath (Path): the file.
 
-class Topics(str, Enum):
-    def __str__(self):
-        return str(
-            self.value
-        )  # make str(Topics.TOPIC) return the Topic instead of an Enum object
-
-    INCONSISTENT = "inconsistent filename(s)"
-    MALFORMED_OR_OUTDATED_MORE_INFO_LINK = (
-        "malformed or outdated more info link page(s)"
-    )
-    MALFORMED_OR_OUTDATED_SEE_ALSO_MENTIONS = (
-        "malformed or outdated see also mention(s)"
-    )
-    ALIAS_PAGES = "missing alias page(s)"
-    PAGE_TITLES = "mismatched page title(s)"
-    MISSING_TLDR = "missing TLDR page(s)"
-    MISPLACED = "misplaced page(s)"
-    BASED_ON_COMMAND_COUNT = "outdated page(s) based on number of commands"
-    BASED_ON_COMMAND_CONTENTS = "outdated page(s) based on the commands itself"
-    BASED_ON_HEADER_LINE_COUNT = "outdated page(s) based on number of header lines"
-    MISSING_ENGLISH = "missing English page(s)"
-    MISSING_TRANSLATED = "missing translated page(s)"
-    LINT_ERRORS = "linter error(s)"
-
-
-def parse_file(filepath):
-    with filepath.open(encoding="utf-8") as file:
-        content = file.read().strip()
-        return content.split("\n") if content else []
+    Returns:
+    tuple (int, list of str): the number of items, and the items or None if there are too many to list.
+    """
+
+    count = 0
+    last_byte = b"\n"
+    chunks = []
+    with filepath.open("rb") as file:
+        while chunk := file.read(1024 * 1024):
+            count += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+            if chunks is not None:
+                chunks.append(chunk)
+                if count >= MAX_LISTED_ITEMS:
+                    chunks = None
+    # A last line without a trailing newline.
+    count += last_byte != b"\n"
+    if chunks is None or count >= MAX_LISTED_ITEMS:
+        return count, None
+
+    content = b"".join(chunks).decode("utf-8").replace("\r\n", "\n").strip()
+    items = content.split("\n") if content else []
+    return len(items), items
 
 
 def parse_language_directory(directory):
-    topics = [
-        "inconsistent",
-        "malformed-or-outdated-more-info-link",
-        "malformed-or-outdated-see-also-mentions",
-        "alias-pages",
-        "page-titles",
-        "missing-tldr",
-        "misplaced",
-        "based-on-command-count",
-        "based-on-command-contents",
-        "based-on-header-line-count",
-        "missing-english",
-        "missing-translated",
-        "lint-errors",
-    ]
-    lang_data = {topic: [] for topic in topics}
-
-    for topic in topics:
-        topic_files = [f for f in Path(directory).iterdir() if topic in f.name]
-        for file in topic_files:
-            filepath = Path(directory) / file
-            lang_data[topic].extend(parse_file(filepath))
+    """
+    Load the check results of a check-pages directory, listing it once.
+
+    Parameters:
+    directory (Path): the check-pages directory of a locale.
+
+    Returns:
+    dict: the number of items and the items per topic, the items are None for topics that are too large to list.
+    """
+
+    topic_files = get_topic_files(get_locale(directory))
+    lang_data = {topic: (0, []) for topic in CHECK_PAGES_TOPIC_FILES}
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            topic = topic_files.get(entry.name)
+            if topic is None:
+                continue
+
+            lang_data[topic] = read_items(Path(entry.path))
 
     return lang_data
 
 
-def generate_markdown_for_language(language, data):
+def sort_by_staleness(items, freshness_index):
+    """
+    Sort outdated pages by how long ago their English page changed, the stalest first.
+
+    Parameters:
+    items (list of str): the outdated pages, e.g. "pages.fr/common/tar.md".
+    freshness_index (dict): the freshness index.
+
+    Returns:
+    list (list of tuple): the pages with their staleness, which is None for pages that aren't older than their English
+    page according to the index.
+    """
+
+    items = [(item, get_staleness(freshness_index, item.strip())) for item in items]
+    # The sort is stable, so the pages without staleness stay in order at the end.
+    return sorted(items, key=lambda item: get_staleness_sort_key(item[1]))
+
+
+def generate_markdown_for_language(language, data, freshness_index=None):
     markdown = f"## {language} language Issues\n"
     markdown += "<!-- __NOUPDATE__ -->\n"
     markdown += f"**Last updated:** {get_datetime_pretty()}\n"
@@ -87,11 +126,9 @@ def generate_markdown_for_language(language, data):
 
     has_issues = False
 
-    for topic, items in data.items():
-        title = topic.replace("-", "_").upper()
-        topic_title = getattr(Topics, title).value
-        number_of_items = len(items)
-        if number_of_items >= 1000:
+    for topic, (number_of_items, items) in data.items():
+        topic_title = get_topic_title(topic)
+        if number_of_items >= MAX_LISTED_ITEMS:
             has_issues = True
             markdown += f"\n{number_of_items} {topic_title}\n\n"
         elif items:
@@ -99,6 +136,14 @@ def generate_markdown_for_language(language, data):
             markdown += (
                 f"\n<details>\n  <summary>{number_of_items} {topic_title}</summary>\n\n"
             )
+            if freshness_index and topic in OUTDATED_TOPICS:
+                for item, staleness in sort_by_staleness(items, freshness_index):
+                    markdown += f"- {generate_github_edit_link(item)}"
+                    if staleness:
+                        markdown += f" ({format_staleness(staleness)})"
+                    markdown += "\n"
+                markdown += "</details>\n"
+                continue
             for item in items:
                 match topic:
                     case "inconsistent":
@@ -126,21 +171,35 @@ def main():
         root = get_tldr_root()
         check_pages_dir = get_check_pages_dir(root)
 
+        freshness_index = load_index(root / FRESHNESS_INDEX_FILE)
+
+        # Fetch the issues once instead of once per language. Like a lookup by title, the first (newest) issue with a
+        # title wins.
+        issues = {}
+        for issue in get_github_issue() or []:
+            issues.setdefault(issue["title"], issue)
+
         for lang_dir in check_pages_dir:
             locale = get_locale(lang_dir)
             print(f"Updating {locale}")
 
             title = f"Translation Dashboard Status for {locale}"
 
-            issue_data = get_github_issue(title)
+            issue_data = issues.get(title)
 
             if not issue_data:
-                issue_data = create_github_issue(title)
+                with stage("create-issue", locale):
+                    issue_data = create_github_issue(title)
 
             markdown_content = f"# {title}\n\n"
 
-            lang_data = parse_language_directory(lang_dir)
-            markdown_content += generate_markdown_for_language(locale, lang_data)
+            with stage("parse-check-pages", locale):
+                lang_data = parse_language_directory(lang_dir)
+
+            with stage("generate-markdown", locale):
+                markdown_content += generate_markdown_for_language(
+                    locale, lang_data, freshness_index
+                )
 
             if strip_dynamic_content(markdown_content) == strip_dynamic_content(
                 issue_data["body"]
@@ -150,7 +209,8 @@ def main():
                 )
                 continue
 
-            update_github_issue(issue_data["number"], title, markdown_content)
+            with stage("update-issue", locale):
+                update_github_issue(issue_data["number"], title, markdown_content)
     else:
         print("Not in a CI or incorrect repository, refusing to run.", file=sys.stderr)
         sys.exit(0)
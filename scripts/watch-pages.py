@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+
+"""
+Keep the results of check-pages.sh up to date while editing pages.
+
+Usage:
+    ./scripts/watch-pages.py [--socket <socket>] serve [-l <locales>] [--tldr-root <tldr>]
+    ./scripts/watch-pages.py [--socket <socket>] query <page | status>
+
+`serve` loads the pages of the given locales (comma separated, by default all) and English once, writes the
+`check-pages.<locale>/` outputs and then watches `tldr/pages*` for changes (with inotify on Linux, by polling
+elsewhere). Only the checks affected by a changed page are run again, and only the output files that changed are
+rewritten. The linters aren't run, their output files are left untouched.
+
+`query` asks the running `serve` for the current results of one page (e.g. `pages.fr/common/tar.md`), or for the
+number of results per check and locale with `status`.
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import struct
+import ctypes
+import signal
+import argparse
+import selectors
+
+from pathlib import Path
+from _common import Colors, create_colored_line
+from _locale_rules import load_locale_rules
+from _page_checks import (
+    CHECK_FILES,
+    LocalePages,
+    PageChecks,
+    get_check_file,
+    write_check_file,
+)
+
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Watch directory trees for changed files with inotify.
+    """
+
+    def __init__(self, directories: list[Path]):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for directory in directories:
+            self.add_tree(directory)
+
+    def add_tree(self, directory: Path) -> list[Path]:
+        """
+        Watch a directory and its subdirectories.
+
+        Returns:
+        list (list of Path): the files already in the directory tree.
+        """
+
+        files = []
+        for root, _, names in os.walk(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd >= 0:
+                self.directories[wd] = Path(root)
+            files.extend(Path(root) / name for name in names)
+        return files
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read_changes(self) -> tuple[set[Path], bool]:
+        """
+        Read the pending events.
+
+        Returns:
+        tuple (set of Path, bool): the changed files, and whether events were lost so everything must be reloaded.
+        """
+
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if wd not in self.directories or not name:
+                    continue
+
+                path = self.directories[wd] / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self.add_tree(path))
+                    else:
+                        # A moved or removed directory: its pages are found missing when updated.
+                        changed.add(path)
+                else:
+                    changed.add(path)
+
+        return changed, overflow
+
+
+class PollingWatcher:
+    """
+    Watch directory trees for changed files by comparing modification times, where inotify isn't available.
+    """
+
+    def __init__(self, directories: list[Path]):
+        self.directories = directories
+        self.mtimes = self.scan()
+
+    def scan(self) -> dict[Path, int]:
+        mtimes = {}
+        for directory in self.directories:
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    path = Path(root) / name
+                    try:
+                        mtimes[path] = path.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        pass
+        return mtimes
+
+    def fileno(self) -> int:
+        return None
+
+    def read_changes(self) -> tuple[set[Path], bool]:
+        mtimes = self.scan()
+        changed = {
+            path
+            for path in mtimes.keys() | self.mtimes.keys()
+            if mtimes.get(path) != self.mtimes.get(path)
+        }
+        self.mtimes = mtimes
+        return changed, False
+
+
+class PageWatcher:
+    """
+    Keep the check results of several locales in memory and their output files up to date.
+    """
+
+    def __init__(self, tldr_root: Path, locales: list[str]):
+        self.tldr_root = tldr_root
+        rules = load_locale_rules(tldr_root)
+
+        self.english = LocalePages(tldr_root, "en", rules.get_see_also_prefix("en"))
+        self.locale_pages = {"en": self.english}
+        for locale in locales:
+            if locale != "en":
+                self.locale_pages[locale] = LocalePages(
+                    tldr_root, locale, rules.get_see_also_prefix(locale)
+                )
+        self.checks = {
+            locale: PageChecks(pages, self.english)
+            for locale, pages in self.locale_pages.items()
+            if locale in locales
+        }
+
+    def load(self):
+        for pages in self.locale_pages.values():
+            pages.load()
+        for checks in self.checks.values():
+            checks.check_all()
+            self.write_outputs(checks)
+
+    def write_outputs(self, checks: PageChecks) -> list[Path]:
+        written = []
+        for check in CHECK_FILES:
+            path = get_check_file(check, checks.locale)
+            if write_check_file(path, checks.get_lines(check)):
+                written.append(path)
+        return written
+
+    def get_locale_pages(self, page: str) -> LocalePages:
+        dirname = page.split("/", 1)[0]
+        return next(
+            (pages for pages in self.locale_pages.values() if pages.dirname == dirname),
+            None,
+        )
+
+    def update(self, paths: set[Path]) -> list[Path]:
+        """
+        Update the changed files and rerun the affected checks.
+
+        Returns:
+        list (list of Path): the output files that were rewritten.
+        """
+
+        changed = {}
+        for path in paths:
+            page = str(path.relative_to(self.tldr_root))
+            locale_pages = self.get_locale_pages(page)
+            if locale_pages is None:
+                continue
+
+            if path.suffix == ".md":
+                changed[page] = locale_pages.update(page)
+            else:
+                # A removed or moved directory, update every page that was in it.
+                for known_page in list(locale_pages.pages):
+                    if known_page.startswith(page + "/"):
+                        changed[known_page] = locale_pages.update(known_page)
+
+        written = []
+        if changed:
+            for checks in self.checks.values():
+                checks.recheck(changed)
+                written.extend(self.write_outputs(checks))
+        return written
+
+    def query(self, request: str) -> dict:
+        if request == "status":
+            return {
+                locale: {
+                    check: sum(len(lines) for lines in checks.results[check].values())
+                    for check in CHECK_FILES
+                }
+                for locale, checks in self.checks.items()
+            }
+
+        locale_pages = self.get_locale_pages(request)
+        if locale_pages is None or locale_pages.locale not in self.checks:
+            return {"error": f"{request} isn't a page of a watched locale"}
+        return {
+            "page": request,
+            "exists": request in locale_pages.pages,
+            "results": self.checks[locale_pages.locale].get_page_results(request),
+        }
+
+
+def get_locales(tldr_root: Path, locales: str) -> list[str]:
+    if locales:
+        return locales.split(",")
+    return ["en"] + sorted(
+        path.name.split(".", 1)[1] for path in tldr_root.glob("pages.*")
+    )
+
+
+def serve(args):
+    locales = get_locales(args.tldr_root, args.locales)
+    watcher = PageWatcher(args.tldr_root.resolve(), locales)
+
+    start = time.perf_counter()
+    watcher.load()
+    pages = sum(len(pages.pages) for pages in watcher.locale_pages.values())
+    print(
+        f"Checked {pages} pages of {', '.join(locales)} in {time.perf_counter() - start:.2f}s"
+    )
+
+    directories = [
+        watcher.tldr_root / pages.dirname for pages in watcher.locale_pages.values()
+    ]
+    try:
+        files = InotifyWatcher(directories)
+    except (OSError, AttributeError):
+        print("inotify isn't available, polling for changes every second")
+        files = PollingWatcher(directories)
+
+    if args.socket.exists():
+        args.socket.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(args.socket))
+    server.listen()
+
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ, "query")
+    if files.fileno() is not None:
+        selector.register(files.fileno(), selectors.EVENT_READ, "files")
+
+    # Stop cleanly (removing the socket) when terminated, not only on Ctrl+C.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"Watching for changes, query with: {sys.argv[0]} query <page>")
+    try:
+        while True:
+            events = selector.select(timeout=None if files.fileno() else 1)
+            sources = {key.data for key, _ in events}
+
+            if "files" in sources or files.fileno() is None:
+                changed, overflow = files.read_changes()
+                start = time.perf_counter()
+                if overflow:
+                    watcher.load()
+                    written = ["all outputs"]
+                else:
+                    written = watcher.update(changed)
+                if written:
+                    print(
+                        f"Updated {', '.join(map(str, written))} in {(time.perf_counter() - start) * 1000:.1f}ms"
+                    )
+
+            if "query" in sources:
+                connection, _ = server.accept()
+                with connection:
+                    request = connection.makefile(encoding="utf-8").readline().strip()
+                    response = json.dumps(watcher.query(request))
+                    connection.sendall(response.encode() + b"\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        args.socket.unlink(missing_ok=True)
+
+
+def query(args):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(args.socket))
+    except OSError as e:
+        if e.errno in (errno.ENOENT, errno.ECONNREFUSED):
+            print(
+                create_colored_line(
+                    Colors.RED, f"No watch-pages.py serve is listening on {args.socket}"
+                ),
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        raise
+
+    with client:
+        client.sendall(args.request.encode() + b"\n")
+        response = json.loads(client.makefile(encoding="utf-8").readline())
+
+    if "error" in response:
+        print(create_colored_line(Colors.RED, response["error"]), file=sys.stderr)
+        sys.exit(1)
+
+    if args.request == "status":
+        for locale, counts in response.items():
+            print(f"{locale}:")
+            for check, count in counts.items():
+                print(f"  {count} {check}")
+        return
+
+    if not response["results"]:
+        print(create_colored_line(Colors.GREEN, f"{args.request}: no issues"))
+    for check, lines in response["results"].items():
+        for line in lines:
+            print(create_colored_line(Colors.RED, f"{check}: {line}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep the results of check-pages.sh up to date while editing pages."
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=Path(".watch-pages.sock"),
+        help="the socket to answer queries on (default: %(default)s)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="watch the pages")
+    serve_parser.add_argument(
+        "-l",
+        dest="locales",
+        help="the locales to check, comma separated (default: all)",
+    )
+    serve_parser.add_argument(
+        "--tldr-root",
+        type=Path,
+        default=Path(os.environ.get("TLDR_ROOT", "tldr")),
+        help="the tldr repository (default: %(default)s)",
+    )
+
+    query_parser = subparsers.add_parser("query", help="query the watched pages")
+    query_parser.add_argument(
+        "request", help="a page (e.g. pages.fr/common/tar.md) or status"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+    else:
+        query(args)
+
+
+if __name__ == "__main__":
+    main()